@@ -1,4 +1,3 @@
-import matplotlib.pyplot as plt
 from math import exp
 from typing import Dict, Union, Callable, Optional
 
@@ -52,6 +51,8 @@ class FuzzySet:
     
     def plot(self):
         """Визуализация дискретного множества."""
+        import matplotlib.pyplot as plt
+
         if self.data_type != "discrete":
             print(f"Множество {self.name} не является дискретным для визуализации")
             return
@@ -0,0 +1,85 @@
+"""
+Бенчмарк времени импорта ядра нечеткого вывода.
+
+Каждый замер выполняется в отдельном интерпретаторе: импортируются модули ядра,
+проверяется, что matplotlib и pandas при этом не загружены, и сравнивается
+лучшее из нескольких времен импорта с бюджетом.
+
+Запуск: python bench_import.py [--budget-ms 250] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+
+CORE_MODULES = [
+    "fuzzy_sets",
+    "linguistic_variable",
+    "fuzzy_rules",
+    "fuzzy_control_system",
+    "fuzzy_spec",
+    "main",
+]
+FORBIDDEN_MODULES = ["matplotlib", "pandas"]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = time.perf_counter() - start
+try:
+    import resource
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+except ImportError:
+    rss_mb = None
+print(json.dumps({{
+    "seconds": elapsed,
+    "rss_mb": rss_mb,
+    "loaded": [m for m in {forbidden!r} if m in sys.modules],
+}}))
+"""
+
+
+def measure_import(modules=CORE_MODULES, repeat: int = 5):
+    """Возвращает лучшее время импорта (с), пиковую память (МБ) и запрещенные модули."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    code = _PROBE.format(modules=list(modules), forbidden=FORBIDDEN_MODULES)
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=here,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        runs.append(json.loads(out.stdout))
+    best = min(runs, key=lambda r: r["seconds"])
+    loaded = sorted({m for r in runs for m in r["loaded"]})
+    return best["seconds"], best["rss_mb"], loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=250.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    seconds, rss_mb, loaded = measure_import(repeat=args.repeat)
+    rss = f"{rss_mb:.1f} МБ" if rss_mb is not None else "н/д"
+    print(f"Импорт ядра: {seconds * 1000:.1f} мс, пиковая память процесса: {rss}")
+
+    assert not loaded, f"Ядро импортирует тяжелые зависимости: {', '.join(loaded)}"
+    assert seconds * 1000 <= args.budget_ms, (
+        f"Импорт ядра занял {seconds * 1000:.1f} мс "
+        f"при бюджете {args.budget_ms:.0f} мс"
+    )
+    print("Бюджет импорта соблюден")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""
+Набор бенчмарков стека нечеткого вывода.
+
+Сценарии параметризованы числом правил, размером универсума, размером пакета
+и размером отношений. Системы и каталоги входов генерируются синтетически
+с фиксированным зерном, результаты сохраняются в JSON. В режиме сравнения
+результаты сопоставляются с сохраненным базовым файлом, и замедления сверх
+порога отмечаются (код возврата 1).
+
+Запуск:
+    python bench_inference.py --output results.json
+    python bench_inference.py --quick --compare results.json --threshold 0.2
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import numpy as np
+from typing import Callable, Dict, List
+from fuzzy_sets import FuzzySet, TriangularMembership, TrapezoidalMembership
+from linguistic_variable import LinguisticVariable
+from fuzzy_rules import FuzzyRule
+from fuzzy_control_system import FuzzyControlSystem
+from relations import FuzzyRelation
+
+OUTPUT_VAR = "Output"
+
+
+def generate_partition(
+    var: LinguisticVariable, num_terms: int, rng: np.random.Generator
+):
+    """Добавляет в переменную равномерное разбиение из num_terms термов."""
+    lo, hi = var.domain_min, var.domain_max
+    centers = np.linspace(lo, hi, num_terms)
+    step = (hi - lo) / max(num_terms - 1, 1)
+    for t, center in enumerate(centers):
+        if rng.random() < 0.5:
+            mu = TriangularMembership(center - step, center, center + step)
+        else:
+            mu = TrapezoidalMembership(
+                center - step, center - step / 4, center + step / 4, center + step
+            )
+        var.add_term(FuzzySet(f"T{t}", mu))
+
+
+def generate_system(
+    num_rules: int,
+    num_inputs: int = 4,
+    terms_per_var: int = 5,
+    universe_points: int = 100,
+    max_conditions: int = 4,
+    seed: int = 0,
+) -> FuzzyControlSystem:
+    """Генерирует систему со случайной базой правил заданного размера."""
+    rng = np.random.default_rng(seed)
+    system = FuzzyControlSystem()
+    for i in range(num_inputs):
+        var = LinguisticVariable(f"X{i}", 0.0, 1000.0 * (i + 1), universe_points)
+        generate_partition(var, terms_per_var, rng)
+        system.add_input_variable(var)
+    output_var = LinguisticVariable(OUTPUT_VAR, 0.0, 1.0, universe_points)
+    generate_partition(output_var, terms_per_var, rng)
+    system.add_output_variable(output_var)
+
+    input_names = list(system.input_vars)
+    for r in range(num_rules):
+        rule = FuzzyRule(f"R{r}")
+        count = rng.integers(1, min(max_conditions, num_inputs) + 1)
+        for var_name in rng.choice(input_names, size=count, replace=False):
+            rule.add_condition(str(var_name), f"T{rng.integers(terms_per_var)}", "AND")
+        rule.set_conclusion(OUTPUT_VAR, f"T{rng.integers(terms_per_var)}")
+        system.add_rule(rule)
+    return system
+
+
+def generate_catalog(
+    system: FuzzyControlSystem, size: int, seed: int = 0
+) -> Dict[str, np.ndarray]:
+    """Генерирует каталог входов, равномерно распределенных по областям переменных."""
+    rng = np.random.default_rng(seed)
+    return {
+        name: rng.uniform(var.domain_min, var.domain_max, size)
+        for name, var in system.input_vars.items()
+    }
+
+
+def generate_relation(rows: int, columns: int, seed: int = 0) -> FuzzyRelation:
+    """Генерирует случайное нечеткое отношение rows x columns."""
+    rng = np.random.default_rng(seed)
+    return FuzzyRelation(
+        [f"r{i}" for i in range(rows)],
+        [f"c{j}" for j in range(columns)],
+        rng.random((rows, columns)).tolist(),
+    )
+
+
+def _rows(catalog: Dict[str, np.ndarray]) -> List[Dict[str, float]]:
+    names = list(catalog)
+    return [dict(zip(names, values)) for values in zip(*catalog.values())]
+
+
+def scenarios(quick: bool, seed: int) -> List[Dict]:
+    """
+    Возвращает список сценариев: {"name", "params", "setup", "items"}.
+    setup() возвращает функцию без аргументов, выполняющую items операций.
+    """
+    rule_counts = [20, 200] if quick else [20, 200, 2000]
+    universe_sizes = [100, 10000] if quick else [100, 10000, 150000]
+    batch_sizes = [64, 1024] if quick else [1, 64, 1024, 16384]
+    relation_sizes = [10, 100] if quick else [10, 100, 300]
+    records = 50 if quick else 200
+
+    result = []
+    for num_rules in rule_counts:
+
+        def setup_infer(num_rules=num_rules):
+            system = generate_system(num_rules, seed=seed)
+            rows = _rows(generate_catalog(system, records, seed))
+            return lambda: [system.infer_mamdani(r, OUTPUT_VAR) for r in rows]
+
+        def setup_rules(num_rules=num_rules):
+            system = generate_system(num_rules, seed=seed)
+            fuzzified = [
+                system.fuzzify(r)
+                for r in _rows(generate_catalog(system, records, seed))
+            ]
+            return lambda: [system.rule_base.evaluate_all(f) for f in fuzzified]
+
+        result.append(
+            {
+                "name": "infer_mamdani",
+                "params": {"rules": num_rules},
+                "setup": setup_infer,
+                "items": records,
+            }
+        )
+        result.append(
+            {
+                "name": "evaluate_all",
+                "params": {"rules": num_rules},
+                "setup": setup_rules,
+                "items": records,
+            }
+        )
+
+    for points in universe_sizes:
+
+        def setup_membership(points=points):
+            var = LinguisticVariable("X", 0.0, 15000.0, points)
+            generate_partition(var, 5, np.random.default_rng(seed))
+            return lambda: [var.membership_vector(t) for t in var.terms]
+
+        result.append(
+            {
+                "name": "membership_vector",
+                "params": {"points": points},
+                "setup": setup_membership,
+                "items": 5,
+            }
+        )
+
+    for batch in batch_sizes:
+
+        def setup_batch(batch=batch):
+            system = generate_system(200, seed=seed)
+            catalog = generate_catalog(system, batch, seed)
+            return lambda: system.infer_mamdani_batch(catalog, OUTPUT_VAR)
+
+        result.append(
+            {
+                "name": "infer_mamdani_batch",
+                "params": {"rules": 200, "batch": batch},
+                "setup": setup_batch,
+                "items": batch,
+            }
+        )
+
+    for size in relation_sizes:
+
+        def setup_relation(size=size):
+            left = generate_relation(size, size, seed)
+            right = generate_relation(size, size, seed + 1)
+            right.rows = left.columns
+            return lambda: left.compose(right)
+
+        result.append(
+            {
+                "name": "relation_compose",
+                "params": {"size": size},
+                "setup": setup_relation,
+                "items": 1,
+            }
+        )
+    return result
+
+
+def time_call(fn: Callable, repeat: int, min_time: float = 0.05) -> List[float]:
+    """Возвращает времена repeat замеров; вызовы повторяются до min_time на замер."""
+    start = time.perf_counter()
+    fn()
+    single = max(time.perf_counter() - start, 1e-9)
+    loops = max(1, int(min_time / single))
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        times.append((time.perf_counter() - start) / loops)
+    return times
+
+
+def scenario_key(entry: Dict) -> str:
+    params = ",".join(f"{k}={v}" for k, v in sorted(entry["params"].items()))
+    return f"{entry['name']}[{params}]"
+
+
+def run(
+    quick: bool = False, seed: int = 0, repeat: int = 5, name_filter: str = None
+) -> Dict:
+    """Выполняет сценарии и возвращает машиночитаемые результаты."""
+    results = []
+    for scenario in scenarios(quick, seed):
+        key = scenario_key(scenario)
+        if name_filter and name_filter not in key:
+            continue
+        fn = scenario["setup"]()
+        times = time_call(fn, repeat)
+        median = statistics.median(times)
+        results.append(
+            {
+                "key": key,
+                "name": scenario["name"],
+                "params": scenario["params"],
+                "median_s": median,
+                "min_s": min(times),
+                "items_per_s": scenario["items"] / median,
+            }
+        )
+        print(
+            f"{key:45s} {median * 1000:10.3f} мс  {scenario['items'] / median:12.0f} эл./с"
+        )
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "seed": seed,
+            "quick": quick,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Возвращает описания сценариев, замедлившихся более чем на threshold."""
+    base = {r["key"]: r for r in baseline["results"]}
+    slowdowns = []
+    for r in current["results"]:
+        if r["key"] not in base:
+            continue
+        ratio = r["median_s"] / base[r["key"]]["median_s"]
+        marker = "ЗАМЕДЛЕНИЕ" if ratio > 1 + threshold else ""
+        print(f"{r['key']:45s} x{ratio:6.2f} {marker}")
+        if marker:
+            slowdowns.append(f"{r['key']}: x{ratio:.2f}")
+    return slowdowns
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарки нечеткого вывода")
+    parser.add_argument(
+        "--quick", action="store_true", help="сокращенный набор сценариев"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", help="выполнять только сценарии, содержащие строку")
+    parser.add_argument("--output", help="сохранить результаты в JSON-файл")
+    parser.add_argument("--compare", help="базовый JSON-файл для сравнения")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="допустимое замедление (0.2 = 20%%)",
+    )
+    args = parser.parse_args()
+
+    current = run(args.quick, args.seed, args.repeat, args.filter)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\nСравнение с {args.compare} (порог {args.threshold:.0%}):")
+        slowdowns = compare(current, baseline, args.threshold)
+        if slowdowns:
+            print("Обнаружены замедления:\n  " + "\n  ".join(slowdowns))
+            sys.exit(1)
+        print("Замедлений не обнаружено")
+
+
+if __name__ == "__main__":
+    main()
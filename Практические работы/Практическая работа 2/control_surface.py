@@ -0,0 +1,186 @@
+import json
+import numbers
+import numpy as np
+from typing import Dict, List, Sequence, Union
+
+
+class ControlSurface:
+    """
+    Предвычисленная поверхность управления нечеткой системы.
+
+    Система один раз опрашивается на сетке (в том числе неравномерной)
+    по всем входным переменным, результаты хранятся в компактном массиве.
+    Запрос выполняется мультилинейной интерполяцией по 2^d вершинам ячейки,
+    т.е. за O(1) независимо от числа правил и точек дискретизации выхода.
+    """
+
+    def __init__(
+        self,
+        var_names: List[str],
+        grids: List[np.ndarray],
+        values: np.ndarray,
+        output_var_name: str,
+        max_error: float = None,
+    ):
+        """
+        Args:
+            var_names: имена входных переменных (порядок осей)
+            grids: возрастающие узлы сетки по каждой оси
+            values: массив значений выхода формы (len(grid_0), ..., len(grid_d))
+            output_var_name: имя выходной переменной
+            max_error: оценка максимальной ошибки относительно точного вывода
+        """
+        if len(var_names) != len(grids) or values.ndim != len(grids):
+            raise ValueError("Размерность сетки не совпадает с числом переменных")
+        for name, grid in zip(var_names, grids):
+            if len(grid) < 2 or np.any(np.diff(grid) <= 0):
+                raise ValueError(
+                    f"Сетка переменной {name} должна содержать "
+                    f"не менее двух строго возрастающих узлов"
+                )
+        if values.shape != tuple(len(grid) for grid in grids):
+            raise ValueError(
+                f"Форма массива значений {values.shape} не совпадает "
+                f"с числом узлов сетки {tuple(len(grid) for grid in grids)}"
+            )
+        self.var_names = list(var_names)
+        self.grids = [np.asarray(g, dtype=float) for g in grids]
+        self.values = values
+        self.output_var_name = output_var_name
+        self.max_error = max_error
+
+    @classmethod
+    def from_system(
+        cls,
+        system,
+        output_var_name: str,
+        grid: Dict[str, Union[int, Sequence[float]]] = None,
+        num_points: int = 100,
+        error_samples: int = 0,
+        seed: int = 0,
+        dtype=np.float32,
+    ) -> "ControlSurface":
+        """
+        Строит поверхность, вычисляя вывод Мамдани во всех узлах сетки.
+
+        Args:
+            system: FuzzyControlSystem
+            output_var_name: имя выходной переменной
+            grid: {имя_переменной: число_узлов | последовательность узлов};
+                  для отсутствующих переменных используется 11 равномерных узлов
+            num_points: дискретизация выходного универсума при точном выводе
+            error_samples: число случайных точек для оценки ошибки (0 — не оценивать)
+            seed: зерно генератора точек для оценки ошибки
+            dtype: тип элементов массива значений
+        """
+        grid = grid or {}
+        var_names = list(system.input_vars.keys())
+        grids = []
+        for name in var_names:
+            var = system.input_vars[name]
+            spec = grid.get(name, 11)
+            if isinstance(spec, numbers.Integral):  # в том числе np.int64
+                grids.append(np.linspace(var.domain_min, var.domain_max, int(spec)))
+            else:
+                grids.append(np.unique(np.asarray(spec, dtype=float)))
+
+        shape = tuple(len(g) for g in grids)
+        values = np.empty(shape, dtype=dtype)
+        for idx in np.ndindex(*shape):
+            inputs = {name: grids[d][i] for d, (name, i) in enumerate(zip(var_names, idx))}
+            values[idx] = system.infer_mamdani(inputs, output_var_name, num_points)[0]
+
+        surface = cls(var_names, grids, values, output_var_name)
+        if error_samples > 0:
+            surface.estimate_error(system, error_samples, num_points, seed)
+        return surface
+
+    def infer_batch(self, inputs: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Интерполирует выход для пакета входов.
+
+        Args:
+            inputs: {имя_переменной: массив значений}, массивы одной длины
+
+        Returns:
+            Массив четких значений выхода
+        """
+        lower = []
+        frac = []
+        for name, grid in zip(self.var_names, self.grids):
+            x = np.clip(np.asarray(inputs[name], dtype=float), grid[0], grid[-1])
+            i = np.clip(np.searchsorted(grid, x, side="right") - 1, 0, len(grid) - 2)
+            lower.append(i)
+            frac.append((x - grid[i]) / (grid[i + 1] - grid[i]))
+
+        result = np.zeros(np.broadcast(*lower).shape, dtype=float)
+        for corner in np.ndindex(*([2] * len(self.grids))):
+            weight = 1.0
+            index = []
+            for d, bit in enumerate(corner):
+                weight = weight * (frac[d] if bit else 1.0 - frac[d])
+                index.append(lower[d] + bit)
+            result += weight * self.values[tuple(index)]
+        return result
+
+    def infer(self, input_values: Dict[str, float]) -> float:
+        """Интерполирует выход для одного набора входов."""
+        return float(self.infer_batch(input_values))
+
+    def __call__(self, input_values: Dict[str, float]) -> float:
+        return self.infer(input_values)
+
+    def estimate_error(
+        self, system, num_samples: int = 200, num_points: int = 100, seed: int = 0
+    ) -> float:
+        """
+        Оценивает максимальную абсолютную ошибку интерполяции относительно
+        точного вывода Мамдани: половина точек берется в центрах случайных
+        ячеек (там ошибка мультилинейной интерполяции наибольшая),
+        половина — равномерно по области определения сетки.
+        """
+        rng = np.random.default_rng(seed)
+        max_error = 0.0
+        for k in range(num_samples):
+            point = {}
+            for name, grid in zip(self.var_names, self.grids):
+                if k % 2 == 0:
+                    i = rng.integers(0, len(grid) - 1)
+                    point[name] = (grid[i] + grid[i + 1]) / 2
+                else:
+                    point[name] = rng.uniform(grid[0], grid[-1])
+            exact = system.infer_mamdani(point, self.output_var_name, num_points)[0]
+            max_error = max(max_error, abs(exact - self.infer(point)))
+        self.max_error = max_error
+        return max_error
+
+    def save(self, path: str):
+        """Сохраняет поверхность в файл .npz."""
+        meta = {
+            "var_names": self.var_names,
+            "output_var_name": self.output_var_name,
+            "max_error": self.max_error,
+        }
+        arrays = {f"grid_{d}": g for d, g in enumerate(self.grids)}
+        np.savez_compressed(
+            path, values=self.values, meta=np.array(json.dumps(meta)), **arrays
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "ControlSurface":
+        """Загружает поверхность, сохраненную методом save."""
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            grids = [data[f"grid_{d}"] for d in range(len(meta["var_names"]))]
+            values = data["values"]
+        return cls(
+            meta["var_names"],
+            grids,
+            values,
+            meta["output_var_name"],
+            meta["max_error"],
+        )
+
+    def __repr__(self):
+        shape = "x".join(str(len(g)) for g in self.grids)
+        return f"ControlSurface({self.output_var_name}, vars={self.var_names}, grid={shape})"
@@ -1,8 +1,13 @@
 import numpy as np
-from typing import Dict, List, Tuple
-from linguistic_variable import LinguisticVariable
+from time import perf_counter
+from typing import Any, Dict, List, Tuple
+from fuzzy_sets import ParametricMembership
+from linguistic_variable import LinguisticVariable, piecewise_linear_weights
 from fuzzy_rules import FuzzyRule, RuleBase
 
+# С какого размера пакета фазификация выбирает значения внутри носителя терма
+SPARSE_MIN_BATCH = 256
+
 
 class FuzzyControlSystem:
     """
@@ -16,32 +21,250 @@ class FuzzyControlSystem:
     def __init__(self):
         self.input_vars: Dict[str, LinguisticVariable] = {}
         self.output_vars: Dict[str, LinguisticVariable] = {}
+        self.stats = None  # InferenceStats при включенном инструментировании
+        self.cache = None  # InferenceCache при включенном кэшировании
+        self._vars_version = 0  # увеличивается при добавлении переменных и замене базы правил
         self.rule_base = RuleBase()
 
+    @property
+    def rule_base(self) -> RuleBase:
+        return self._rule_base
+
+    @rule_base.setter
+    def rule_base(self, rule_base: RuleBase):
+        # Другая база может иметь тот же счетчик version, поэтому замена
+        # меняет версию модели (и сбрасывает кэш результатов)
+        self._rule_base = rule_base
+        rule_base.stats = self.stats
+        self._vars_version += 1
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["stats"] = None  # статистика не передается между процессами
+        state["cache"] = None  # как и кэш результатов
+        return state
+
+    def enable_cache(self, precision: Dict[str, float] = None, max_size: int = 4096):
+        """
+        Включает кэширование результатов infer_mamdani.
+
+        Args:
+            precision: {имя_входной_переменной: шаг квантования}; вывод
+                       выполняется для входов, округленных к этому шагу
+            max_size: наибольшее число хранимых результатов (вытеснение LRU)
+        """
+        from inference_cache import InferenceCache
+
+        self.cache = InferenceCache(precision, max_size)
+        return self.cache
+
+    def disable_cache(self):
+        """Выключает кэширование результатов."""
+        self.cache = None
+
+    def cache_info(self) -> Dict[str, Any]:
+        """Счетчики кэша (пустой словарь, если кэш выключен)."""
+        return self.cache.info() if self.cache is not None else {}
+
+    def model_version(self) -> Tuple[int, ...]:
+        """Версия модели: меняется при изменении правил, переменных или их термов."""
+        return (
+            self._vars_version,
+            self.rule_base.version,
+            *(var.version for var in self.input_vars.values()),
+            *(var.version for var in self.output_vars.values()),
+        )
+
+    def enable_stats(self):
+        """
+        Включает сбор статистики вывода: время этапов, число вызовов,
+        сработавших правил и активных термов по переменным.
+        В выключенном состоянии накладные расходы отсутствуют.
+        """
+        from instrumentation import InferenceStats
+
+        if self.stats is None:
+            self.stats = InferenceStats()
+        self.rule_base.stats = self.stats
+        return self.stats
+
+    def disable_stats(self):
+        """Выключает сбор статистики и останавливает периодическую запись."""
+        if self.stats is not None:
+            self.stats.stop_periodic_dump()
+        self.stats = None
+        self.rule_base.stats = None
+
+    def stats_snapshot(self) -> Dict[str, Any]:
+        """Возвращает снимок статистики (пустой словарь, если сбор выключен)."""
+        return self.stats.snapshot() if self.stats is not None else {}
+
     def add_input_variable(self, var: LinguisticVariable):
         self.input_vars[var.name] = var
+        self._vars_version += 1
 
     def add_output_variable(self, var: LinguisticVariable):
         self.output_vars[var.name] = var
+        self._vars_version += 1
 
     def add_rule(self, rule: FuzzyRule):
         """Добавляет правило в систему."""
         self.rule_base.add_rule(rule)
 
+    def minimize_rules(self) -> Dict[str, Any]:
+        """
+        Удаляет из базы правил дубликаты, поглощенные и невыполнимые правила
+        без изменения выхода (см. rule_minimization.minimize_rule_base).
+        """
+        from rule_minimization import minimize_rule_base
+
+        return minimize_rule_base(self.rule_base, self.input_vars)
+
     def fuzzify(self, input_values: Dict[str, float]) -> Dict[str, Dict[str, float]]:
         """
         Фазификация всех входных значений.
-        Возвращает словарь: {имя_переменной: {имя_терма: степень_принадлежности}}
+        Возвращает разреженный словарь: {имя_переменной: {имя_терма: степень_принадлежности}},
+        термы с нулевой степенью принадлежности опускаются.
         """
         fuzzified = {}
         for var_name, value in input_values.items():
             if var_name in self.input_vars:
-                var = self.input_vars[var_name]
-                fuzzified[var_name] = {}
-                for term_name, term_set in var.terms.items():
-                    fuzzified[var_name][term_name] = term_set.mu(value)
+                fuzzified[var_name] = self.input_vars[var_name].fuzzify_crisp(value)
+        return fuzzified
+
+    def fuzzify_batch(
+        self, input_values: Dict[str, np.ndarray]
+    ) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Фазификация пакета входных значений.
+        Возвращает разреженный словарь: {имя_переменной: {имя_терма: массив степеней}},
+        термы, носитель которых не содержит ни одного значения пакета, опускаются.
+
+        Для терма с известным носителем [lo, hi] функция принадлежности
+        вычисляется только для значений пакета, попавших в носитель
+        (для пакетов от SPARSE_MIN_BATCH значений).
+        """
+        fuzzified = {}
+        for var_name, values in input_values.items():
+            if var_name in self.input_vars:
+                values = np.asarray(values, dtype=float)
+                low, high = values.min(initial=np.inf), values.max(initial=-np.inf)
+                terms = {}
+                for term_name, term_set in self.input_vars[var_name].terms.items():
+                    if term_set.support is None:
+                        terms[term_name] = term_set.mu_array(values)
+                        continue
+                    lo, hi = term_set.support
+                    if hi < low or lo > high:
+                        continue  # носитель не пересекает диапазон пакета
+                    if (lo <= low and high <= hi) or len(values) < SPARSE_MIN_BATCH:
+                        # на малых пакетах выборка по маске дороже самих вычислений
+                        terms[term_name] = term_set.mu_array(values)
+                        continue
+                    inside = np.flatnonzero((values >= lo) & (values <= hi))
+                    if len(inside) == 0:
+                        continue
+                    degrees = np.zeros(len(values))
+                    degrees[inside] = term_set.mu_array(values[inside])
+                    terms[term_name] = degrees
+                fuzzified[var_name] = terms
         return fuzzified
 
+    def _tsk_default(self, output_var_name: str) -> float:
+        """Выход TSK при отсутствии сработавших правил."""
+        if output_var_name in self.output_vars:
+            output_var = self.output_vars[output_var_name]
+            return (output_var.domain_min + output_var.domain_max) / 2
+        return 0.0
+
+    def infer_tsk(self, input_values: Dict[str, float], output_var_name: str) -> float:
+        """
+        Вывод по методу Такаги-Сугено-Канга.
+
+        Выход — среднее выходов TSK-правил, взвешенное степенями их активации.
+        Универсум выходной переменной и дефазификация не требуются.
+        """
+        fuzzified_inputs = self.fuzzify(input_values)
+
+        numerator = 0.0
+        denominator = 0.0
+        for rule in self.rule_base.rules:
+            if rule.tsk_conclusion and rule.tsk_conclusion[0] == output_var_name:
+                activation = rule.evaluate(fuzzified_inputs)
+                if activation > 0:
+                    numerator += activation * float(rule.tsk_output(input_values))
+                    denominator += activation
+
+        if denominator == 0:
+            return self._tsk_default(output_var_name)
+        return numerator / denominator
+
+    def infer_tsk_batch(
+        self, input_values: Dict[str, np.ndarray], output_var_name: str
+    ) -> np.ndarray:
+        """
+        Пакетный вывод Такаги-Сугено-Канга.
+
+        Args:
+            input_values: {имя_переменной: массив значений}, массивы одной длины
+            output_var_name: имя выходной переменной
+
+        Returns:
+            Массив четких значений выхода
+        """
+        input_values = {
+            name: np.asarray(values, dtype=float)
+            for name, values in input_values.items()
+        }
+        size = len(next(iter(input_values.values())))
+        activations = self.rule_base.evaluate_batch(
+            self.fuzzify_batch(input_values), size
+        )
+
+        size = activations.shape[0]
+        numerator = np.zeros(size)
+        denominator = np.zeros(size)
+        for i, rule in enumerate(self.rule_base.rules):
+            if rule.tsk_conclusion and rule.tsk_conclusion[0] == output_var_name:
+                numerator += activations[:, i] * rule.tsk_output(input_values)
+                denominator += activations[:, i]
+
+        result = np.full(size, self._tsk_default(output_var_name))
+        fired = denominator > 0
+        result[fired] = numerator[fired] / denominator[fired]
+        return result
+
+    def _output_universe(
+        self,
+        output_var: LinguisticVariable,
+        num_points: int,
+        activations: Dict[str, float] = None,
+    ) -> np.ndarray:
+        """
+        Дискретизация выходного универсума.
+
+        Для равномерной переменной — np.linspace из num_points точек.
+        Для адаптивной — сетка переменной, дополненная точками, в которых
+        активные термы достигают уровней среза: между соседними точками
+        агрегированная функция линейна, и центр тяжести вычисляется точно.
+        """
+        if output_var.discretization != "adaptive":
+            return np.linspace(output_var.domain_min, output_var.domain_max, num_points)
+        universe = output_var.universe()
+        if not activations:
+            return universe
+        levels = sorted(set(activations.values()))
+        extra = []
+        for term_name in activations:
+            mu_func = getattr(output_var.terms[term_name], "mu_func", None)
+            if isinstance(mu_func, ParametricMembership):
+                for alpha in levels:
+                    extra.extend(mu_func.level_points(min(alpha, 1.0)))
+        if not extra:
+            return universe
+        extra = np.clip(extra, output_var.domain_min, output_var.domain_max)
+        return np.union1d(universe, extra)
+
     def infer_mamdani(
         self,
         input_values: Dict[str, float],
@@ -56,42 +279,305 @@ class FuzzyControlSystem:
         2. Оценка правил
         3. Композиция (аккумуляция) выходных термов
         4. Дефазификация
+
+        Для выходной переменной с discretization="adaptive" num_points
+        не используется: универсум строится по изломам термов, а центр
+        тяжести считается квадратурой по неравномерной сетке.
+
+        При включенном кэше (enable_cache) вывод выполняется для квантованных
+        входов, а результат берется из кэша, если он уже вычислялся.
+        """
+        if self.cache is not None:
+            return self.cache.get_or_compute(
+                self.model_version(),
+                input_values,
+                (output_var_name, num_points),
+                lambda inputs: self._infer_mamdani(inputs, output_var_name, num_points),
+            )
+        return self._infer_mamdani(input_values, output_var_name, num_points)
+
+    def _infer_mamdani(
+        self,
+        input_values: Dict[str, float],
+        output_var_name: str,
+        num_points: int,
+    ) -> Tuple[float, np.ndarray, np.ndarray]:
+        rule_activations = self._evaluate_rules(input_values)
+        result = self._mamdani_output(output_var_name, rule_activations, num_points)
+        if self.stats is not None:
+            self.stats.count("inferences")
+        return result
+
+    def infer_all(
+        self, input_values: Dict[str, float], num_points: int = 100
+    ) -> Dict[str, Tuple[float, np.ndarray, np.ndarray]]:
         """
+        Вывод Мамдани сразу для всех выходных переменных.
+
+        Фазификация и оценка правил выполняются один раз, аккумуляция
+        и дефазификация — для каждого выхода по общим степеням активации.
+
+        Returns:
+            {имя_выходной_переменной: (четкое значение, универсум, агрегированная функция)}
+        """
+        if self.cache is not None:
+            return self.cache.get_or_compute(
+                self.model_version(),
+                input_values,
+                (None, num_points),
+                lambda inputs: self._infer_all(inputs, num_points),
+            )
+        return self._infer_all(input_values, num_points)
+
+    def _infer_all(
+        self, input_values: Dict[str, float], num_points: int
+    ) -> Dict[str, Tuple[float, np.ndarray, np.ndarray]]:
+        rule_activations = self._evaluate_rules(input_values)
+        results = {
+            name: self._mamdani_output(name, rule_activations, num_points)
+            for name in self.output_vars
+        }
+        if self.stats is not None:
+            self.stats.count("inferences")
+        return results
+
+    def _evaluate_rules(
+        self, input_values: Dict[str, float]
+    ) -> Dict[Tuple[str, str], float]:
+        """Шаги 1-2 вывода Мамдани: фазификация и оценка правил."""
+        stats = self.stats
+        if stats is not None:
+            start = perf_counter()
+
         # 1. Фазификация
         fuzzified_inputs = self.fuzzify(input_values)
 
+        if stats is not None:
+            stats.record_stage("fuzzify", perf_counter() - start)
+            stats.record_fuzzification(fuzzified_inputs)
+
         # 2. Оценка правил
-        rule_activations = self.rule_base.evaluate_all(fuzzified_inputs)
+        return self.rule_base.evaluate_all(fuzzified_inputs)
+
+    def _mamdani_output(
+        self,
+        output_var_name: str,
+        rule_activations: Dict[Tuple[str, str], float],
+        num_points: int,
+    ) -> Tuple[float, np.ndarray, np.ndarray]:
+        """Шаги 3-4 вывода Мамдани для одной выходной переменной."""
+        stats = self.stats
+        if stats is not None:
+            start = perf_counter()
 
         # 3. Композиция и аккумуляция
         output_var = self.output_vars[output_var_name]
-        universe = np.linspace(output_var.domain_min, output_var.domain_max, num_points)
+        active = {
+            term_name: activation
+            for (var_name, term_name), activation in rule_activations.items()
+            if var_name == output_var_name and activation > 0
+        }
+        universe = self._output_universe(output_var, num_points, active)
 
         aggregated_output = np.zeros_like(universe, dtype=float)
 
-        for (var_name, term_name), activation in rule_activations.items():
-            if var_name == output_var_name and activation > 0:
-                term_set = output_var.terms[term_name]
+        for term_name, activation in active.items():
+            term_set = output_var.terms[term_name]
+
+            # Получаем функцию принадлежности терма
+            membership = term_set.mu_array(universe)
 
-                # Получаем функцию принадлежности терма
-                membership = np.array([term_set.mu(x) for x in universe])
+            # "Обрезаем" функцию по степени активации (метод Мамдани)
+            clipped = np.minimum(membership, activation)
 
-                # "Обрезаем" функцию по степени активации (метод Мамдани)
-                clipped = np.minimum(membership, activation)
+            # Аккумулируем с помощью операции максимума
+            aggregated_output = np.maximum(aggregated_output, clipped)
 
-                # Аккумулируем с помощью операции максимума
-                aggregated_output = np.maximum(aggregated_output, clipped)
+        if stats is not None:
+            now = perf_counter()
+            stats.record_stage("aggregate", now - start)
+            start = now
 
         # 4. Дефазификация (центр тяжести)
         if np.sum(aggregated_output) == 0:
             crisp_value = (output_var.domain_min + output_var.domain_max) / 2
+        elif output_var.discretization == "adaptive":
+            w0, w1 = piecewise_linear_weights(universe)
+            crisp_value = (aggregated_output @ w1) / (aggregated_output @ w0)
         else:
             crisp_value = np.sum(universe * aggregated_output) / np.sum(
                 aggregated_output
             )
 
+        if stats is not None:
+            stats.record_stage("defuzzify", perf_counter() - start)
         return crisp_value, universe, aggregated_output
 
+    def infer_mamdani_batch(
+        self,
+        input_values: Dict[str, np.ndarray],
+        output_var_name: str,
+        num_points: int = 100,
+        chunk_size: int = 4096,
+    ) -> np.ndarray:
+        """
+        Пакетный вывод по методу Мамдани (те же шаги, что и в infer_mamdani).
+
+        Args:
+            input_values: {имя_переменной: массив значений}, массивы одной длины
+            output_var_name: имя выходной переменной
+            num_points: число точек дискретизации выходного универсума
+            chunk_size: число входов, агрегируемых за раз
+                        (ограничивает память буфера chunk_size x num_points)
+
+        Returns:
+            Массив четких значений выхода
+        """
+        return self._infer_batch(
+            input_values, [output_var_name], num_points, chunk_size
+        )[output_var_name]
+
+    def infer_all_batch(
+        self,
+        input_values: Dict[str, np.ndarray],
+        num_points: int = 100,
+        chunk_size: int = 4096,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Пакетный вывод Мамдани для всех выходных переменных: фазификация
+        и оценка правил выполняются один раз на порцию входов.
+
+        Returns:
+            {имя_выходной_переменной: массив четких значений}
+        """
+        return self._infer_batch(
+            input_values, list(self.output_vars), num_points, chunk_size
+        )
+
+    def _batch_output_plan(self, output_var_name: str, num_points: int) -> tuple:
+        """
+        Данные пакетной аккумуляции выхода: универсум, веса квадратуры,
+        функции принадлежности термов, номера выходных термов правил
+        и значение по умолчанию.
+        """
+        output_var = self.output_vars[output_var_name]
+        universe = self._output_universe(output_var, num_points)
+        if output_var.discretization == "adaptive":
+            # Уровни среза у входов пакета разные, поэтому изломы термов
+            # дополняются равномерной сеткой, а интеграл берется квадратурой
+            universe = np.union1d(
+                universe,
+                np.linspace(output_var.domain_min, output_var.domain_max, num_points),
+            )
+            w0, w1 = piecewise_linear_weights(universe)
+        else:
+            w0, w1 = np.ones(num_points), universe
+        term_names = list(output_var.terms)
+        memberships = np.array(
+            [output_var.terms[name].mu_array(universe) for name in term_names]
+        )
+
+        # Номер выходного терма каждого правила (-1 — правило не про этот выход)
+        rule_terms = np.array(
+            [
+                term_names.index(rule.conclusion[1])
+                if rule.conclusion and rule.conclusion[0] == output_var_name
+                else -1
+                for rule in self.rule_base.rules
+            ],
+            dtype=np.intp,
+        )
+        default = (output_var.domain_min + output_var.domain_max) / 2
+        return w0, w1, memberships, rule_terms, default
+
+    def _infer_batch(
+        self,
+        input_values: Dict[str, np.ndarray],
+        output_var_names: List[str],
+        num_points: int,
+        chunk_size: int,
+    ) -> Dict[str, np.ndarray]:
+        input_values = {
+            name: np.asarray(values, dtype=float)
+            for name, values in input_values.items()
+        }
+        plans = {
+            name: self._batch_output_plan(name, num_points) for name in output_var_names
+        }
+
+        size = len(next(iter(input_values.values())))
+        results = {name: np.empty(size) for name in output_var_names}
+        stats = self.stats
+        for offset in range(0, size, chunk_size):
+            chunk = {
+                name: values[offset : offset + chunk_size]
+                for name, values in input_values.items()
+            }
+            if stats is not None:
+                start = perf_counter()
+
+            # 1-2. Фазификация и оценка правил
+            fuzzified = self.fuzzify_batch(chunk)
+
+            if stats is not None:
+                stats.record_stage("fuzzify", perf_counter() - start)
+                stats.record_batch_fuzzification(fuzzified)
+
+            activations = self.rule_base.evaluate_batch(
+                fuzzified, len(next(iter(chunk.values())))
+            )
+
+            for name, (w0, w1, memberships, rule_terms, default) in plans.items():
+                if stats is not None:
+                    start = perf_counter()
+
+                # 3. Композиция и аккумуляция
+                aggregated = np.zeros((activations.shape[0], len(w0)))
+                for t in range(len(memberships)):
+                    fired = rule_terms == t
+                    if np.any(fired):
+                        level = activations[:, fired].max(axis=1)
+                        np.maximum(
+                            aggregated,
+                            np.minimum(memberships[t], level[:, None]),
+                            out=aggregated,
+                        )
+
+                if stats is not None:
+                    now = perf_counter()
+                    stats.record_stage("aggregate", now - start)
+                    start = now
+
+                # 4. Дефазификация (центр тяжести)
+                total = aggregated @ w0
+                crisp = np.full(len(total), default)
+                nonzero = total != 0
+                crisp[nonzero] = (aggregated[nonzero] @ w1) / total[nonzero]
+                results[name][offset : offset + chunk_size] = crisp
+
+                if stats is not None:
+                    stats.record_stage("defuzzify", perf_counter() - start)
+            if stats is not None:
+                stats.count("inferences", activations.shape[0])
+        return results
+
+    def build_control_surface(
+        self,
+        output_var_name: str,
+        grid: Dict[str, object] = None,
+        num_points: int = 100,
+        error_samples: int = 0,
+    ):
+        """
+        Предвычисляет поверхность управления для быстрого вывода
+        интерполяцией (см. ControlSurface.from_system).
+        """
+        from control_surface import ControlSurface
+
+        return ControlSurface.from_system(
+            self, output_var_name, grid, num_points, error_samples
+        )
+
     def print_system_info(self):
         print("\nВходные переменные:")
         for name, var in self.input_vars.items():
@@ -1,3 +1,4 @@
+from time import perf_counter
 from typing import List, Tuple, Dict, Any
 import numpy as np
 
@@ -9,11 +10,34 @@ class FuzzyRule:
     """
 
     def __init__(self, name: str = "Неименованное правило"):
+        # Базы правил, содержащие правило: их версия меняется при изменении правила
+        self._rule_bases: List["RuleBase"] = []
         self.name = name
         self.conditions: List[Tuple[str, str, str]] = (
             []
         )  # (var_name, term_name, connective)
         self.conclusion: Tuple[str, str] = None  # (var_name, term_name)
+        self.tsk_conclusion: Tuple[str, float, Dict[str, float]] = (
+            None  # (var_name, constant, {input_var: coefficient})
+        )
+
+    @property
+    def conditions(self) -> List[Tuple[str, str, str]]:
+        """
+        Условия правила. Изменять их следует через add_condition или
+        присваиванием нового списка: изменение списка на месте базы правил не заметят.
+        """
+        return self._conditions
+
+    @conditions.setter
+    def conditions(self, conditions: List[Tuple[str, str, str]]):
+        self._conditions = conditions
+        self._changed()
+
+    def _changed(self):
+        """Сообщает базам правил, что правило изменилось."""
+        for rule_base in self._rule_bases:
+            rule_base._changed()
 
     def add_condition(self, var_name: str, term_name: str, connective: str = "AND"):
         """
@@ -24,11 +48,39 @@ class FuzzyRule:
             term_name: имя термина
             connective: "AND"
         """
-        self.conditions.append((var_name, term_name, connective))
+        self._conditions.append((var_name, term_name, connective))
+        self._changed()
 
     def set_conclusion(self, var_name: str, term_name: str):
         """Устанавливает заключение правила."""
         self.conclusion = (var_name, term_name)
+        self._changed()
+
+    def set_tsk_conclusion(
+        self,
+        var_name: str,
+        constant: float = 0.0,
+        coefficients: Dict[str, float] = None,
+    ):
+        """
+        Устанавливает заключение Такаги-Сугено-Канга:
+        var_name = constant + sum(coefficients[x] * x).
+
+        Args:
+            var_name: имя выходной переменной
+            constant: свободный член (для правила нулевого порядка — выход правила)
+            coefficients: коэффициенты при входных переменных {var_name: k}
+        """
+        self.tsk_conclusion = (var_name, float(constant), dict(coefficients or {}))
+        self._changed()
+
+    def tsk_output(self, input_values: Dict[str, Any]):
+        """Вычисляет выход TSK-заключения (скаляр или массив для пакета входов)."""
+        _, constant, coefficients = self.tsk_conclusion
+        result = constant
+        for var_name, k in coefficients.items():
+            result = result + k * np.asarray(input_values[var_name], dtype=float)
+        return result
 
     def evaluate(self, fuzzified_inputs: Dict[str, Dict[str, float]]) -> float:
         """
@@ -46,13 +98,11 @@ class FuzzyRule:
         activation = 1.0
         for var_name, term_name, connective in self.conditions:
             if connective == "AND":
-                if (
-                    var_name in fuzzified_inputs
-                    and term_name in fuzzified_inputs[var_name]
-                ):
-                    activation = min(activation, fuzzified_inputs[var_name][term_name])
-                else:
-                    activation = 0.0
+                # Фазификация разреженная: отсутствующий терм имеет степень 0
+                degree = fuzzified_inputs.get(var_name, {}).get(term_name, 0.0)
+                if degree <= 0:
+                    return 0.0
+                activation = min(activation, degree)
 
         return activation
 
@@ -60,37 +110,316 @@ class FuzzyRule:
         conditions_str = " AND ".join(
             [f"{var} == {term}" for var, term, _ in self.conditions]
         )
-        conclusion_str = (
-            f"{self.conclusion[0]} == {self.conclusion[1]}"
-            if self.conclusion
-            else "Нет заключения"
-        )
+        if self.conclusion:
+            conclusion_str = f"{self.conclusion[0]} == {self.conclusion[1]}"
+        elif self.tsk_conclusion:
+            var_name, constant, coefficients = self.tsk_conclusion
+            terms = [f"{constant:g}"] + [f"{k:g}*{x}" for x, k in coefficients.items()]
+            conclusion_str = f"{var_name} = {' + '.join(terms)}"
+        else:
+            conclusion_str = "Нет заключения"
         return f"IF {conditions_str} THEN {conclusion_str}"
 
 
+class _RuleList(list):
+    """
+    Список правил базы: любое изменение списка увеличивает версию базы,
+    а добавленные правила сообщают базе о своих изменениях.
+    """
+
+    def __init__(self, rule_base: "RuleBase", rules=()):
+        super().__init__(rules)
+        self._rule_base = rule_base
+
+    def __reduce__(self):
+        # База подключается заново в RuleBase.__setstate__
+        return (_RuleList, (None, list(self)))
+
+    def _changed(self, added=()):
+        if self._rule_base is not None:
+            self._rule_base._track(added)
+            self._rule_base._changed()
+
+    def __setitem__(self, index, value):
+        added = list(value) if isinstance(index, slice) else [value]
+        super().__setitem__(index, added if isinstance(index, slice) else value)
+        self._changed(added)
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._changed()
+
+    def __iadd__(self, rules):
+        rules = list(rules)
+        super().__iadd__(rules)
+        self._changed(rules)
+        return self
+
+    def append(self, rule: FuzzyRule):
+        super().append(rule)
+        self._changed([rule])
+
+    def extend(self, rules):
+        rules = list(rules)
+        super().extend(rules)
+        self._changed(rules)
+
+    def insert(self, index, rule: FuzzyRule):
+        super().insert(index, rule)
+        self._changed([rule])
+
+    def pop(self, index=-1):
+        rule = super().pop(index)
+        self._changed()
+        return rule
+
+    def remove(self, rule: FuzzyRule):
+        super().remove(rule)
+        self._changed()
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._changed()
+
+    def reverse(self):
+        super().reverse()
+        self._changed()
+
+
 class RuleBase:
     """База правил нечёткой системы."""
 
     def __init__(self):
-        self.rules: List[FuzzyRule] = []
+        self.version = 0  # увеличивается при каждом изменении правил
+        self._indexed_version = None  # версия, для которой построен индекс
+        self._compiled_version = None  # версия, для которой построен _compiled
+        self.rules = []
+        self._compiled = None  # (ключи (var, term), матрица индексов столбцов)
+        # Инвертированный индекс {(var_name, term_name): [номера правил]}
+        self._term_index: Dict[Tuple[str, str], List[int]] = {}
+        self._required: List[int] = []  # число AND-условий каждого правила
+        # Правила, в которых есть условия, но нет ни одного AND-условия,
+        # активны всегда (см. FuzzyRule.evaluate)
+        self._unconditional: List[int] = []
+        self.rules_evaluated = 0  # счетчик оцененных правил
+        self.rules_skipped = 0  # счетчик правил, отброшенных по индексу
+        self.stats = None  # InferenceStats при включенном инструментировании
+        self._build_index()
+
+    @property
+    def rules(self) -> List[FuzzyRule]:
+        return self._rules
+
+    @rules.setter
+    def rules(self, rules: List[FuzzyRule]):
+        self._rules = _RuleList(self, rules)
+        self._track(self._rules)
+        self._changed()
+
+    def _track(self, rules):
+        """Подписывает базу на изменения правил rules."""
+        for rule in rules:
+            if self not in rule._rule_bases:
+                rule._rule_bases.append(self)
+
+    def _changed(self):
+        self.version += 1
 
     def add_rule(self, rule: FuzzyRule):
         """Добавляет правило в базу."""
+        fresh = self._indexed_version == self.version
         self.rules.append(rule)
+        if fresh:
+            # Индекс был актуален: достаточно дописать в него новое правило
+            self._index_rule(len(self.rules) - 1, rule)
+            self._indexed_version = self.version
+
+    def _index_rule(self, position: int, rule: FuzzyRule):
+        """Регистрирует AND-условия правила в инвертированном индексе."""
+        keys = {
+            (var_name, term_name)
+            for var_name, term_name, connective in rule.conditions
+            if connective == "AND"
+        }
+        for key in keys:
+            self._term_index.setdefault(key, []).append(position)
+        self._required.append(len(keys))
+        if not keys and rule.conditions:
+            self._unconditional.append(position)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["stats"] = None  # статистика не передается между процессами
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._rules._rule_base = self
+
+    def _build_index(self):
+        """Строит инвертированный индекс для текущей версии правил."""
+        self._term_index = {}
+        self._required = []
+        self._unconditional = []
+        for position, rule in enumerate(self.rules):
+            self._index_rule(position, rule)
+        self._indexed_version = self.version
+
+    def reindex(self):
+        """
+        Перестраивает индекс и меняет версию базы.
+        Изменения списка правил и условий через методы замечаются и без него.
+        """
+        self._changed()
+        self._build_index()
+
+    def candidate_rules(
+        self, fuzzified_inputs: Dict[str, Dict[str, float]]
+    ) -> List[int]:
+        """
+        Возвращает номера правил, все AND-условия которых активны
+        (имеют ненулевую степень) при данной фазификации.
+        Правила без условий не возвращаются: их активация всегда 0.
+        """
+        if self._indexed_version != self.version:
+            self._build_index()
+        hits: Dict[int, int] = {}
+        for var_name, terms in fuzzified_inputs.items():
+            for term_name, degree in terms.items():
+                if degree > 0:
+                    for position in self._term_index.get((var_name, term_name), ()):
+                        hits[position] = hits.get(position, 0) + 1
+        candidates = [
+            position
+            for position, count in hits.items()
+            if count == self._required[position]
+        ]
+        candidates.extend(self._unconditional)
+        return candidates
+
+    def reset_counters(self):
+        """Сбрасывает счетчики оцененных и пропущенных правил."""
+        self.rules_evaluated = 0
+        self.rules_skipped = 0
+
+    def compile(self):
+        """
+        Компилирует условия правил в матрицу индексов столбцов.
+
+        Столбец 0 — тождественная единица (заполнение коротких правил),
+        столбец 1 — ноль (правила без условий не срабатывают),
+        остальные — степени пар (var_name, term_name) в порядке self._compiled[0].
+        """
+        keys: Dict[Tuple[str, str], int] = {}
+        rows = []
+        for rule in self.rules:
+            row = [
+                keys.setdefault((var_name, term_name), len(keys) + 2)
+                for var_name, term_name, connective in rule.conditions
+                if connective == "AND"
+            ]
+            rows.append(row if rule.conditions else [1])
+        width = max((len(row) for row in rows), default=1) or 1
+        index = np.zeros((len(rows), width), dtype=np.intp)
+        for i, row in enumerate(rows):
+            index[i, : len(row)] = row
+        self._compiled = (list(keys), index)
+        self._compiled_version = self.version
+        return self._compiled
+
+    def evaluate_batch(
+        self, fuzzified_inputs: Dict[str, Dict[str, np.ndarray]], size: int = None
+    ) -> np.ndarray:
+        """
+        Оценивает все правила для пакета фазифицированных входов.
+
+        Фазификация может быть разреженной: отсутствующий терм имеет степень 0
+        во всем пакете. Правила с таким термом в AND-условиях не вычисляются,
+        их активация равна 0.
+
+        Args:
+            fuzzified_inputs: словарь {var_name: {term_name: массив степеней}}
+            size: размер пакета; обязателен, если в fuzzified_inputs нет ни одного терма
+
+        Returns:
+            Матрица степеней активации формы (размер пакета, число правил)
+        """
+        stats = self.stats
+        if stats is not None:
+            start = perf_counter()
+
+        if self._compiled is None or self._compiled_version != self.version:
+            self.compile()
+        keys, index = self._compiled
+        if size is None:
+            size = next(
+                (
+                    len(degrees)
+                    for terms in fuzzified_inputs.values()
+                    for degrees in terms.values()
+                ),
+                None,
+            )
+            if size is None:
+                raise ValueError(
+                    "Пакет фазифицированных входов не содержит ни одного терма, "
+                    "размер пакета нужно передать в size"
+                )
+        ones = np.ones(size)
+        zeros = np.zeros(size)
+        columns = [ones, zeros]
+        present = [True, False]  # есть ли у столбца ненулевые степени в пакете
+        for var_name, term_name in keys:
+            degrees = fuzzified_inputs.get(var_name, {}).get(term_name)
+            columns.append(zeros if degrees is None else degrees)
+            present.append(degrees is not None)
+        degrees = np.stack(columns, axis=1)
+        if all(present[2:]):
+            candidates = np.arange(len(index))
+            activations = degrees[:, index].min(axis=2)
+        else:
+            candidates = np.flatnonzero(np.array(present)[index].all(axis=1))
+            activations = np.zeros((size, len(index)))
+            activations[:, candidates] = degrees[:, index[candidates]].min(axis=2)
+
+        if stats is not None:
+            stats.record_stage("rules", perf_counter() - start)
+            stats.count("rules_evaluated", size * len(candidates))
+            stats.count("rules_skipped", size * (len(index) - len(candidates)))
+            stats.count("rules_fired", int(np.count_nonzero(activations)))
+        return activations
 
     def evaluate_all(
         self, fuzzified_inputs: Dict[str, Dict[str, float]]
     ) -> Dict[Tuple[str, str], float]:
         """
-        Оценивает все правила и возвращает степени активации для каждого вывода.
+        Оценивает правила и возвращает степени активации для каждого вывода.
+        Оцениваются только правила, отобранные по инвертированному индексу
+        (candidate_rules); остальные заведомо имеют нулевую активацию.
 
         Returns:
             Словарь {(output_var, term): activation}
         """
+        stats = self.stats
+        if stats is not None:
+            start = perf_counter()
+
         activations = {}
 
-        for rule in self.rules:
+        candidates = self.candidate_rules(fuzzified_inputs)
+        self.rules_evaluated += len(candidates)
+        self.rules_skipped += len(self.rules) - len(candidates)
+
+        fired = 0
+        for position in candidates:
+            rule = self.rules[position]
             activation = rule.evaluate(fuzzified_inputs)
+            if activation > 0:
+                fired += 1
             if activation > 0 and rule.conclusion:
                 key = (rule.conclusion[0], rule.conclusion[1])
                 if key in activations:
@@ -98,6 +427,11 @@ class RuleBase:
                 else:
                     activations[key] = activation
 
+        if stats is not None:
+            stats.record_stage("rules", perf_counter() - start)
+            stats.count("rules_evaluated", len(candidates))
+            stats.count("rules_skipped", len(self.rules) - len(candidates))
+            stats.count("rules_fired", fired)
         return activations
 
     def print_rules(self):
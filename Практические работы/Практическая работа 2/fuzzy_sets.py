@@ -1,7 +1,106 @@
-import matplotlib.pyplot as plt
+from abc import ABC, abstractmethod
 from typing import Dict, Union, Callable, Optional, Tuple
 import numpy as np
-import matplotlib.pyplot as plt
+
+
+class ParametricMembership(ABC):
+    """
+    Базовый класс параметрической функции принадлежности.
+
+    В отличие от замыканий, объекты сериализуются (pickle, JSON-спецификация)
+    и вычисляются векторно для массивов точек.
+    """
+
+    kind = "parametric"
+
+    def __init__(self, *params: float):
+        self.params = tuple(float(p) for p in params)
+        self.support = (self.params[0], self.params[-1])
+
+    @abstractmethod
+    def __call__(self, x: float) -> float:
+        """Степень принадлежности точки x."""
+
+    @abstractmethod
+    def mu_array(self, xs: np.ndarray) -> np.ndarray:
+        """Степени принадлежности массива точек xs."""
+
+    def level_points(self, alpha: float) -> Tuple[float, float]:
+        """Точки левого и правого склонов, в которых mu(x) = alpha (0 < alpha <= 1)."""
+        a, b, c, d = self.params[0], self.params[1], self.params[-2], self.params[-1]
+        return a + alpha * (b - a), d - alpha * (d - c)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.params == other.params
+
+    def __hash__(self):
+        return hash((self.kind, self.params))
+
+    def __repr__(self):
+        return f"{type(self).__name__}{self.params}"
+
+
+class TriangularMembership(ParametricMembership):
+    """Треугольная функция принадлежности с вершинами (a, b, c)."""
+
+    kind = "triangular"
+
+    def __call__(self, x: float) -> float:
+        a, b, c = self.params
+        if x <= a:
+            return 0.0
+        elif a < x <= b:
+            return (x - a) / (b - a)
+        elif b < x <= c:
+            return (c - x) / (c - b)
+        else:
+            return 0.0
+
+    def mu_array(self, xs: np.ndarray) -> np.ndarray:
+        a, b, c = self.params
+        xs = np.asarray(xs, dtype=float)
+        result = np.zeros_like(xs)
+        rising = (a < xs) & (xs <= b)
+        falling = (b < xs) & (xs <= c)
+        result[rising] = (xs[rising] - a) / (b - a)
+        result[falling] = (c - xs[falling]) / (c - b)
+        return result
+
+
+class TrapezoidalMembership(ParametricMembership):
+    """Трапециевидная функция принадлежности с вершинами (a, b, c, d)."""
+
+    kind = "trapezoidal"
+
+    def __call__(self, x: float) -> float:
+        a, b, c, d = self.params
+        if x <= a:
+            return 0.0
+        elif a < x <= b:
+            return (x - a) / (b - a)
+        elif b < x <= c:
+            return 1.0
+        elif c < x <= d:
+            return (d - x) / (d - c)
+        else:
+            return 0.0
+
+    def mu_array(self, xs: np.ndarray) -> np.ndarray:
+        a, b, c, d = self.params
+        xs = np.asarray(xs, dtype=float)
+        result = np.zeros_like(xs)
+        rising = (a < xs) & (xs <= b)
+        falling = (c < xs) & (xs <= d)
+        result[rising] = (xs[rising] - a) / (b - a)
+        result[(b < xs) & (xs <= c)] = 1.0
+        result[falling] = (d - xs[falling]) / (d - c)
+        return result
+
+
+# Типы параметрических функций принадлежности по имени (для спецификаций)
+MEMBERSHIP_TYPES = {
+    cls.kind: cls for cls in (TriangularMembership, TrapezoidalMembership)
+}
 
 
 class FuzzySet:
@@ -9,14 +108,23 @@ class FuzzySet:
     Универсальный класс нечеткого множества.
     """
 
-    def __init__(self, name: str, data: Union[Dict, Callable] = None):
+    def __init__(
+        self,
+        name: str,
+        data: Union[Dict, Callable] = None,
+        support: Tuple[float, float] = None,
+    ):
         """
         Args:
             name: имя множества
             data: либо словарь {элемент: степень_принадлежности},
                   либо функция принадлежности mu(x)
+            support: носитель [lo, hi] непрерывной функции принадлежности
+                     (вне него mu(x) = 0); по умолчанию берется из
+                     атрибута data.support, если он есть
         """
         self.name = name
+        self.support = support if support is not None else getattr(data, "support", None)
         if isinstance(data, dict):
             self.data_type = "discrete"
             self.data = data
@@ -39,6 +147,17 @@ class FuzzySet:
     def __call__(self, x):
         return self.mu(x)
 
+    def mu_array(self, xs) -> np.ndarray:
+        """Возвращает массив степеней принадлежности для массива точек xs."""
+        xs = np.asarray(xs, dtype=float)
+        if self.data_type == "continuous" and isinstance(
+            self.mu_func, ParametricMembership
+        ):
+            return np.clip(self.mu_func.mu_array(xs), 0.0, 1.0)
+        return np.fromiter((self.mu(x) for x in xs.ravel()), float, xs.size).reshape(
+            xs.shape
+        )
+
     def get_elements(self):
         """Возвращает список элементов (для дискретного множества)."""
         if self.data_type == "discrete":
@@ -53,21 +172,9 @@ class FuzzySet:
 
     def plot(self):
         """Визуализация дискретного множества."""
-        if self.data_type != "discrete":
-            print(f"Множество {self.name} не является дискретным для визуализации")
-            return
-
-        elements = self.get_elements()
-        values = self.get_values()
-
-        plt.figure(figsize=(10, 5))
-        plt.bar(range(len(elements)), values)
-        plt.xticks(range(len(elements)), elements, rotation=45, ha="right")
-        plt.ylim(0, 1)
-        plt.ylabel("μ")
-        plt.title(self.name)
-        plt.tight_layout()
-        plt.show()
+        from plotting import plot_discrete_set
+
+        plot_discrete_set(self)
 
     def apply_modus_ponens(self, relation) -> Optional["FuzzySet"]:
         """
@@ -112,24 +219,6 @@ class FuzzySet:
         self, x_range: Tuple[float, float] = None, num_points: int = 200
     ):
         """Визуализация непрерывной функции принадлежности."""
-        if self.data_type != "continuous":
-            print(f"Множество {self.name} не является непрерывным")
-            return
+        from plotting import plot_continuous_set
 
-        if x_range is None:
-            x_min, x_max = -10, 10
-        else:
-            x_min, x_max = x_range
-
-        x = np.linspace(x_min, x_max, num_points)
-        y = [self.mu(xi) for xi in x]
-
-        plt.figure(figsize=(10, 5))
-        plt.plot(x, y, "b-", linewidth=2)
-        plt.fill_between(x, 0, y, alpha=0.3)
-        plt.xlabel("x")
-        plt.ylabel("μ(x)")
-        plt.title(f"Функция принадлежности: {self.name}")
-        plt.grid(True, alpha=0.3)
-        plt.ylim(0, 1.1)
-        plt.show()
+        plot_continuous_set(self, x_range, num_points)
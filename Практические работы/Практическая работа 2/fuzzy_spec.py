@@ -0,0 +1,137 @@
+"""
+Декларативная спецификация системы нечеткого управления.
+
+Формат (JSON):
+{
+  "inputs":  [{"name": ..., "min": ..., "max": ..., "num_points": ...,
+               "discretization": "uniform" | "adaptive", "tolerance": ...,
+               "terms": [{"name": ..., "type": "triangular", "params": [a, b, c]}]}],
+  "outputs": [... как inputs ...],
+  "rules":   [{"name": ..., "if": [[var, term, connective], ...],
+               "then": [var, term]}
+              | {"name": ..., "if": [...],
+                 "then_tsk": {"var": ..., "constant": ..., "coefficients": {...}}}]
+}
+
+Спецификация содержит только данные, поэтому она и построенная по ней
+система сериализуются pickle и передаются между процессами.
+"""
+
+import json
+from typing import Any, Dict
+from fuzzy_sets import FuzzySet, ParametricMembership, MEMBERSHIP_TYPES
+from linguistic_variable import LinguisticVariable
+from fuzzy_rules import FuzzyRule
+from fuzzy_control_system import FuzzyControlSystem
+
+
+def variable_to_spec(var: LinguisticVariable) -> Dict[str, Any]:
+    """Описывает лингвистическую переменную с параметрическими термами."""
+    terms = []
+    for term_name, term_set in var.terms.items():
+        mu_func = getattr(term_set, "mu_func", None)
+        if not isinstance(mu_func, ParametricMembership):
+            raise TypeError(
+                f"Терм {term_name} переменной {var.name} не задан "
+                f"параметрической функцией принадлежности"
+            )
+        terms.append(
+            {"name": term_name, "type": mu_func.kind, "params": list(mu_func.params)}
+        )
+    return {
+        "name": var.name,
+        "min": var.domain_min,
+        "max": var.domain_max,
+        "num_points": var.num_points,
+        "discretization": var.discretization,
+        "tolerance": var.tolerance,
+        "terms": terms,
+    }
+
+
+def rule_to_spec(rule: FuzzyRule) -> Dict[str, Any]:
+    """Описывает правило."""
+    spec = {"name": rule.name, "if": [list(c) for c in rule.conditions]}
+    if rule.conclusion:
+        spec["then"] = list(rule.conclusion)
+    if rule.tsk_conclusion:
+        var_name, constant, coefficients = rule.tsk_conclusion
+        spec["then_tsk"] = {
+            "var": var_name,
+            "constant": constant,
+            "coefficients": coefficients,
+        }
+    return spec
+
+
+def system_to_spec(system: FuzzyControlSystem) -> Dict[str, Any]:
+    """Строит спецификацию системы нечеткого управления."""
+    return {
+        "inputs": [variable_to_spec(v) for v in system.input_vars.values()],
+        "outputs": [variable_to_spec(v) for v in system.output_vars.values()],
+        "rules": [rule_to_spec(r) for r in system.rule_base.rules],
+    }
+
+
+def variable_from_spec(spec: Dict[str, Any]) -> LinguisticVariable:
+    """Создает лингвистическую переменную по спецификации."""
+    var = LinguisticVariable(
+        spec["name"],
+        spec["min"],
+        spec["max"],
+        spec.get("num_points", 100),
+        spec.get("discretization", "uniform"),
+        spec.get("tolerance", 1e-3),
+    )
+    for term in spec["terms"]:
+        if term["type"] not in MEMBERSHIP_TYPES:
+            raise ValueError(f"Неизвестный тип функции принадлежности: {term['type']}")
+        mu_func = MEMBERSHIP_TYPES[term["type"]](*term["params"])
+        var.add_term(FuzzySet(term["name"], mu_func))
+    return var
+
+
+def rule_from_spec(spec: Dict[str, Any]) -> FuzzyRule:
+    """Создает правило по спецификации."""
+    rule = FuzzyRule(spec.get("name", "Неименованное правило"))
+    for var_name, term_name, *connective in spec["if"]:
+        rule.add_condition(var_name, term_name, *connective)
+    if "then" in spec:
+        rule.set_conclusion(*spec["then"])
+    if "then_tsk" in spec:
+        tsk = spec["then_tsk"]
+        rule.set_tsk_conclusion(
+            tsk["var"], tsk.get("constant", 0.0), tsk.get("coefficients")
+        )
+    return rule
+
+
+def system_from_spec(spec: Dict[str, Any]) -> FuzzyControlSystem:
+    """
+    Создает систему по спецификации и сразу компилирует ее:
+    строит индексы носителей термов, инвертированный индекс
+    и матрицу условий базы правил.
+    """
+    system = FuzzyControlSystem()
+    for var_spec in spec["inputs"]:
+        var = variable_from_spec(var_spec)
+        var._build_term_index()
+        system.add_input_variable(var)
+    for var_spec in spec["outputs"]:
+        system.add_output_variable(variable_from_spec(var_spec))
+    for rule_spec in spec["rules"]:
+        system.add_rule(rule_from_spec(rule_spec))
+    system.rule_base.compile()
+    return system
+
+
+def save_spec(system: FuzzyControlSystem, path: str):
+    """Сохраняет спецификацию системы в JSON-файл."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(system_to_spec(system), f, ensure_ascii=False, indent=2)
+
+
+def load_spec(path: str) -> FuzzyControlSystem:
+    """Загружает систему из JSON-файла спецификации."""
+    with open(path, encoding="utf-8") as f:
+        return system_from_spec(json.load(f))
@@ -0,0 +1,131 @@
+"""
+Кэш результатов нечеткого вывода по квантованным входам.
+
+Входы округляются к сетке с заданным шагом для каждой переменной,
+и вывод выполняется для округленных значений: все входы, попавшие в одну
+ячейку сетки, получают один и тот же результат независимо от порядка
+запросов. Переменные без шага используются как есть (точное совпадение).
+
+Массивы результата (универсум, агрегированная функция) помечаются
+только для чтения: кэш отдает их по ссылке, и изменение на месте
+испортило бы последующие попадания.
+
+Кэш ограничен по размеру и вытесняет давно не использованные записи (LRU).
+Вместе с результатами хранятся версии базы правил и переменных системы;
+при изменении правил или термов кэш очищается при следующем обращении.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+import numpy as np
+
+
+def _freeze(result):
+    """Помечает массивы NumPy в результате (в том числе вложенные) только для чтения."""
+    if isinstance(result, np.ndarray):
+        result.setflags(write=False)
+    elif isinstance(result, (tuple, list)):
+        for item in result:
+            _freeze(item)
+    elif isinstance(result, dict):
+        for item in result.values():
+            _freeze(item)
+    return result
+
+
+class InferenceCache:
+    """LRU-кэш результатов вывода с квантованием входов."""
+
+    def __init__(self, precision: Dict[str, float] = None, max_size: int = 4096):
+        """
+        Args:
+            precision: {имя_входной_переменной: шаг квантования}
+            max_size: наибольшее число хранимых результатов
+        """
+        if max_size < 1:
+            raise ValueError("Размер кэша должен быть положительным")
+        for var_name, step in (precision or {}).items():
+            if step <= 0:
+                raise ValueError(
+                    f"Шаг квантования {var_name} должен быть положительным"
+                )
+        self.precision = dict(precision or {})
+        self.max_size = int(max_size)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def quantize(self, input_values: Dict[str, float]) -> Dict[str, float]:
+        """Округляет входы к сетке квантования."""
+        quantized = {}
+        for var_name, value in input_values.items():
+            step = self.precision.get(var_name)
+            quantized[var_name] = (
+                round(value / step) * step if step is not None else float(value)
+            )
+        return quantized
+
+    def get_or_compute(
+        self,
+        version: Hashable,
+        input_values: Dict[str, float],
+        extra_key: Tuple,
+        compute: Callable[[Dict[str, float]], Any],
+    ):
+        """
+        Возвращает результат из кэша или вычисляет compute(квантованные входы).
+
+        Args:
+            version: версия модели; при ее смене кэш очищается
+            input_values: входы запроса
+            extra_key: остальные параметры запроса (выходная переменная и т.п.)
+            compute: функция вывода для квантованных входов
+        """
+        quantized = self.quantize(input_values)
+        key = (tuple(sorted(quantized.items())), extra_key)
+        with self._lock:
+            if version != self._version:
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._version = version
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        result = _freeze(compute(quantized))
+
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = result
+                if len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return result
+
+    def clear(self):
+        """Очищает кэш и счетчики."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def info(self) -> Dict[str, Any]:
+        """Размер кэша и счетчики обращений."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,144 @@
+"""
+Инструментирование нечеткого вывода: время по этапам и счетчики.
+
+Статистика собирается, только если она включена у системы
+(FuzzyControlSystem.enable_stats); в выключенном состоянии код вывода
+лишь проверяет, что ссылка на статистику равна None.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict
+import numpy as np
+
+
+class InferenceStats:
+    """Накопитель времени этапов вывода и счетчиков."""
+
+    STAGES = ("fuzzify", "rules", "aggregate", "defuzzify")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._dump_timer: threading.Timer = None
+        self._dump_stopped: threading.Event = None
+        self.reset()
+
+    def reset(self):
+        """Обнуляет всю накопленную статистику."""
+        with self._lock:
+            self.started = time.time()
+            self.stage_calls: Dict[str, int] = {s: 0 for s in self.STAGES}
+            self.stage_seconds: Dict[str, float] = {s: 0.0 for s in self.STAGES}
+            self.counters: Dict[str, int] = {
+                "inferences": 0,
+                "rules_evaluated": 0,
+                "rules_skipped": 0,
+                "rules_fired": 0,
+            }
+            # {переменная: [суммарное число активных термов, число фазификаций]}
+            self.active_terms: Dict[str, list] = {}
+
+    def record_stage(self, stage: str, seconds: float):
+        """Учитывает один вызов этапа длительностью seconds."""
+        with self._lock:
+            self.stage_calls[stage] = self.stage_calls.get(stage, 0) + 1
+            self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+
+    def count(self, name: str, value: int = 1):
+        """Увеличивает счетчик name на value."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def record_fuzzification(self, fuzzified: Dict[str, Dict[str, Any]]):
+        """Учитывает число активных термов каждой переменной."""
+        with self._lock:
+            for var_name, terms in fuzzified.items():
+                entry = self.active_terms.setdefault(var_name, [0, 0])
+                entry[0] += len(terms)
+                entry[1] += 1
+
+    def record_batch_fuzzification(self, fuzzified: Dict[str, Dict[str, Any]]):
+        """
+        Учитывает число активных (ненулевых) термов каждой переменной
+        для пакета: {переменная: {терм: массив степеней}}.
+        """
+        counts = {
+            var_name: (
+                sum(int(np.count_nonzero(degrees)) for degrees in terms.values()),
+                len(next(iter(terms.values()), ())),
+            )
+            for var_name, terms in fuzzified.items()
+        }
+        with self._lock:
+            for var_name, (active, samples) in counts.items():
+                entry = self.active_terms.setdefault(var_name, [0, 0])
+                entry[0] += active
+                entry[1] += samples
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Возвращает копию статистики в виде словаря (сериализуемого в JSON)."""
+        with self._lock:
+            stages = {
+                stage: {
+                    "calls": self.stage_calls[stage],
+                    "total_ms": self.stage_seconds[stage] * 1000,
+                    "mean_us": (
+                        self.stage_seconds[stage] / self.stage_calls[stage] * 1e6
+                        if self.stage_calls[stage]
+                        else 0.0
+                    ),
+                }
+                for stage in self.stage_calls
+            }
+            active_terms = {
+                var_name: total / calls if calls else 0.0
+                for var_name, (total, calls) in self.active_terms.items()
+            }
+            return {
+                "uptime_s": time.time() - self.started,
+                "stages": stages,
+                "counters": dict(self.counters),
+                "mean_active_terms": active_terms,
+            }
+
+    def dump_json(self, path: str):
+        """Атомарно записывает снимок статистики в JSON-файл."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    def start_periodic_dump(self, path: str, interval: float = 10.0):
+        """Запускает фоновую запись снимка в path каждые interval секунд."""
+        self.stop_periodic_dump()
+        # Флаг остановки своего запуска: tick прежнего запуска не перезапустит таймер
+        stopped = threading.Event()
+
+        def arm():
+            self._dump_timer = threading.Timer(interval, tick)
+            self._dump_timer.daemon = True
+            self._dump_timer.start()
+
+        def tick():
+            if stopped.is_set():
+                return
+            self.dump_json(path)
+            with self._lock:
+                if not stopped.is_set():
+                    arm()
+
+        with self._lock:
+            self._dump_stopped = stopped
+            arm()
+
+    def stop_periodic_dump(self):
+        """Останавливает фоновую запись снимков."""
+        with self._lock:
+            if self._dump_stopped is not None:
+                self._dump_stopped.set()
+                self._dump_stopped = None
+            if self._dump_timer is not None:
+                self._dump_timer.cancel()
+                self._dump_timer = None
@@ -1,7 +1,26 @@
+from bisect import bisect_left
 from typing import Dict, List
-from fuzzy_sets import FuzzySet
+from fuzzy_sets import FuzzySet, ParametricMembership
 import numpy as np
-import matplotlib.pyplot as plt
+
+
+def piecewise_linear_weights(xs: np.ndarray):
+    """
+    Весовые векторы квадратуры на неравномерной сетке xs.
+
+    Для функции mu, линейной между соседними узлами:
+        интеграл mu(x) dx     = w0 @ mu  (формула трапеций),
+        интеграл x*mu(x) dx   = w1 @ mu  (точно для кусочно-линейной mu).
+    """
+    xs = np.asarray(xs, dtype=float)
+    h = np.diff(xs)
+    w0 = np.zeros_like(xs)
+    w0[:-1] += h / 2
+    w0[1:] += h / 2
+    w1 = np.zeros_like(xs)
+    w1[:-1] += h / 6 * (2 * xs[:-1] + xs[1:])
+    w1[1:] += h / 6 * (xs[:-1] + 2 * xs[1:])
+    return w0, w1
 
 
 class LinguisticVariable:
@@ -11,21 +30,155 @@ class LinguisticVariable:
     """
 
     def __init__(
-        self, name: str, domain_min: float, domain_max: float, num_points: int = 100
+        self,
+        name: str,
+        domain_min: float,
+        domain_max: float,
+        num_points: int = 100,
+        discretization: str = "uniform",
+        tolerance: float = 1e-3,
     ):
+        """
+        Args:
+            name: имя переменной
+            domain_min, domain_max: границы универсума
+            num_points: число точек равномерной дискретизации
+                        (для адаптивной — верхняя граница числа точек)
+            discretization: "uniform" — np.linspace, "adaptive" — точки в изломах
+                            термов с уточнением по кривизне и пересечениям термов
+            tolerance: допустимое отклонение mu от линейной интерполяции
+                       между соседними точками адаптивной сетки
+        """
+        if discretization not in ("uniform", "adaptive"):
+            raise ValueError(f"Неизвестный способ дискретизации: {discretization}")
         self.name = name
         self.domain_min = float(domain_min)
         self.domain_max = float(domain_max)
         self.num_points = int(num_points)
+        self.discretization = discretization
+        self.tolerance = float(tolerance)
         self.terms: Dict[str, FuzzySet] = {}
+        self._term_index = None  # (точки излома, термы интервалов, термы точек)
+        self._adaptive_universe = None
+        self.version = 0  # увеличивается при каждом изменении термов
 
     def add_term(self, fuzzy_set: FuzzySet):
         self.terms[fuzzy_set.name] = fuzzy_set
+        self._term_index = None
+        self._adaptive_universe = None
+        self.version += 1
+
+    def _build_term_index(self):
+        """
+        Строит индекс носителей термов: отсортированные границы носителей
+        разбивают ось на элементарные интервалы, для каждого интервала
+        и каждой границы заранее запоминаются термы, чей носитель их покрывает.
+        Термы без известного носителя считаются активными всюду.
+        """
+        bounded = {n: fs.support for n, fs in self.terms.items() if fs.support}
+        points = sorted({p for lo, hi in bounded.values() for p in (lo, hi)})
+
+        def covering(lo_point: float, hi_point: float) -> List[str]:
+            return [
+                name
+                for name in self.terms
+                if name not in bounded
+                or (bounded[name][0] <= lo_point and hi_point <= bounded[name][1])
+            ]
+
+        bounds = [float("-inf")] + points + [float("inf")]
+        segments = [covering(bounds[i], bounds[i + 1]) for i in range(len(points) + 1)]
+        at_points = [covering(p, p) for p in points]
+        self._term_index = (points, segments, at_points)
+        return self._term_index
+
+    def active_terms(self, x: float) -> List[str]:
+        """
+        Возвращает имена термов, носитель которых содержит x,
+        за O(log n) по числу границ носителей.
+        """
+        points, segments, at_points = self._term_index or self._build_term_index()
+        i = bisect_left(points, x)
+        if i < len(points) and points[i] == x:
+            return at_points[i]
+        return segments[i]
 
     def universe(self):
         """Возвращает список дискретных точек универсума."""
+        if self.discretization == "adaptive":
+            if self._adaptive_universe is None:
+                self._adaptive_universe = self.adaptive_universe()
+            return self._adaptive_universe
         return np.linspace(self.domain_min, self.domain_max, self.num_points)
 
+    def breakpoints(self) -> List[float]:
+        """Изломы параметрических термов внутри универсума (включая его границы)."""
+        points = {self.domain_min, self.domain_max}
+        for fs in self.terms.values():
+            mu_func = getattr(fs, "mu_func", None)
+            if isinstance(mu_func, ParametricMembership):
+                points.update(mu_func.params)
+            elif fs.support:
+                points.update(fs.support)
+        return sorted(p for p in points if self.domain_min <= p <= self.domain_max)
+
+    def adaptive_universe(self, tolerance: float = None, max_points: int = None):
+        """
+        Строит неравномерную дискретизацию универсума.
+
+        1. Точки ставятся в изломы термов (для непараметрических термов
+           дополнительно берется грубая равномерная сетка).
+        2. Отрезок делится пополам, пока какой-либо терм отклоняется
+           от линейной интерполяции в его середине больше чем на tolerance.
+        3. На отрезках, где перекрываются два терма, добавляется точка
+           их пересечения, чтобы агрегирование максимумом не теряло излом.
+
+        Для треугольных и трапециевидных термов шаг 2 не добавляет точек:
+        функции линейны между изломами и сетка точна.
+        """
+        tolerance = self.tolerance if tolerance is None else tolerance
+        max_points = self.num_points if max_points is None else max_points
+        terms = list(self.terms.values())
+
+        def values(x: float) -> np.ndarray:
+            return np.array([fs.mu(x) for fs in terms])
+
+        points = set(self.breakpoints())
+        if any(
+            not isinstance(getattr(fs, "mu_func", None), ParametricMembership)
+            for fs in terms
+        ):
+            points.update(np.linspace(self.domain_min, self.domain_max, 17))
+        xs = sorted(points)
+
+        # Уточнение по кривизне
+        stack = [(x0, x1) for x0, x1 in zip(xs[:-1], xs[1:])]
+        min_width = (self.domain_max - self.domain_min) * 1e-9
+        while stack and len(points) < max_points:
+            x0, x1 = stack.pop()
+            mid = (x0 + x1) / 2
+            error = np.max(
+                np.abs(values(mid) - (values(x0) + values(x1)) / 2), initial=0.0
+            )
+            if error > tolerance and x1 - x0 > min_width:
+                points.add(mid)
+                stack.extend([(x0, mid), (mid, x1)])
+
+        # Пересечения перекрывающихся термов
+        xs = sorted(points)
+        for x0, x1 in zip(xs[:-1], xs[1:]):
+            v0, v1 = values(x0), values(x1)
+            for i in range(len(terms)):
+                for j in range(i + 1, len(terms)):
+                    d0, d1 = v0[i] - v0[j], v1[i] - v1[j]
+                    if d0 * d1 < 0:
+                        points.add(x0 + (x1 - x0) * d0 / (d0 - d1))
+        return np.array(sorted(points))
+
+    def quadrature_weights(self):
+        """Весовые векторы (w0, w1) квадратуры по universe() (см. piecewise_linear_weights)."""
+        return piecewise_linear_weights(self.universe())
+
     def membership_vector(self, term_name: str):
         """Возвращает вектор значений mu(x) по дискретному универсу для заданного терма."""
         if term_name not in self.terms:
@@ -44,28 +197,21 @@ class LinguisticVariable:
     def fuzzify_crisp(self, crisp_value: float) -> Dict[str, float]:
         """
         Фазификация четкого значения.
-        Возвращает словарь {термин: степень принадлежности} для заданного четкого значения.
+        Возвращает разреженный словарь {термин: степень принадлежности},
+        содержащий только термы с ненулевой степенью.
         """
         result = {}
-        for term_name, fuzzy_set in self.terms.items():
-            result[term_name] = fuzzy_set.mu(crisp_value)
+        for term_name in self.active_terms(crisp_value):
+            degree = self.terms[term_name].mu(crisp_value)
+            if degree > 0:
+                result[term_name] = degree
         return result
 
     def plot_terms(self, title: str = None):
         """Визуализация всех терминов лингвистической переменной"""
-        x = self.universe()
-        plt.figure(figsize=(10, 6))
-
-        for term_name, term_set in self.terms.items():
-            y = [term_set.mu(xi) for xi in x]
-            plt.plot(x, y, label=term_name, linewidth=2)
-
-        plt.xlabel("Значение")
-        plt.ylabel("Степень принадлежности μ")
-        plt.title(title or f"Термы лингвистической переменной '{self.name}'")
-        plt.legend()
-        plt.grid(True, alpha=0.3)
-        plt.show()
+        from plotting import plot_variable_terms
+
+        plot_variable_terms(self, title)
 
     def get_term_names(self) -> List[str]:
         """Возвращает список имен терминов."""
@@ -0,0 +1,107 @@
+"""
+Генератор нагрузки для scoring_server.py.
+
+Открывает несколько соединений, по каждому последовательно отправляет запросы
+со случайными входами (замкнутый цикл) и измеряет пропускную способность
+и задержки p50/p99.
+
+Запуск: python load_client.py [--port 8765 | --unix /tmp/fuzzy.sock] [--concurrency 64] [--requests 20000]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import numpy as np
+from typing import List
+
+
+# Диапазоны входов системы из main.setup_cs_fuzzy_system
+INPUT_RANGES = {
+    "Wear": (0.0, 1.0),
+    "Liquidity": (0.0, 1000.0),
+    "Price": (0.0, 15000.0),
+    "Age": (0.0, 15 * 365.0),
+}
+
+
+async def _client(
+    args, requests: int, rng: random.Random, latencies: List[float], errors: List[str]
+):
+    if args.unix:
+        reader, writer = await asyncio.open_unix_connection(args.unix)
+    else:
+        reader, writer = await asyncio.open_connection(args.host, args.port)
+    try:
+        for request_id in range(requests):
+            inputs = {name: rng.uniform(lo, hi) for name, (lo, hi) in INPUT_RANGES.items()}
+            line = json.dumps({"id": request_id, "inputs": inputs}).encode() + b"\n"
+            start = time.perf_counter()
+            writer.write(line)
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - start)
+            if "error" in response:
+                errors.append(response["error"])
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run_load(args) -> dict:
+    """Выполняет нагрузку и возвращает сводку измерений."""
+    latencies: List[float] = []
+    errors: List[str] = []
+    per_client = [args.requests // args.concurrency] * args.concurrency
+    for i in range(args.requests % args.concurrency):
+        per_client[i] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            _client(args, n, random.Random(args.seed + i), latencies, errors)
+            for i, n in enumerate(per_client)
+            if n > 0
+        )
+    )
+    elapsed = time.perf_counter() - start
+
+    ms = np.array(latencies) * 1000
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "seconds": elapsed,
+        "throughput_rps": len(latencies) / elapsed,
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "max_ms": float(ms.max()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Генератор нагрузки сервиса оценки")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="путь Unix-сокета вместо TCP")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="вывести сводку в JSON")
+    args = parser.parse_args()
+
+    summary = asyncio.run(run_load(args))
+    if args.json:
+        print(json.dumps(summary))
+        return
+    print(
+        f"Запросов: {summary['requests']} (ошибок: {summary['errors']}) "
+        f"за {summary['seconds']:.2f} с\n"
+        f"Пропускная способность: {summary['throughput_rps']:.0f} запросов/с\n"
+        f"Задержка: p50 = {summary['p50_ms']:.2f} мс, "
+        f"p99 = {summary['p99_ms']:.2f} мс, max = {summary['max_ms']:.2f} мс"
+    )
+
+
+if __name__ == "__main__":
+    main()
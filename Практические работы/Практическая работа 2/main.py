@@ -1,43 +1,19 @@
 from linguistic_variable import LinguisticVariable
-from fuzzy_sets import FuzzySet
+from fuzzy_sets import FuzzySet, TriangularMembership, TrapezoidalMembership
 from fuzzy_control_system import FuzzyControlSystem
 from fuzzy_rules import FuzzyRule
 from skins import create_sample_skins
-import pandas as pd
+from parallel_scoring import score_skins
 
 
 def create_triangular(a: float, b: float, c: float):
     """Создает треугольную функцию принадлежности."""
-
-    def mu(x: float) -> float:
-        if x <= a:
-            return 0.0
-        elif a < x <= b:
-            return (x - a) / (b - a)
-        elif b < x <= c:
-            return (c - x) / (c - b)
-        else:
-            return 0.0
-
-    return mu
+    return TriangularMembership(a, b, c)
 
 
 def create_trapezoidal(a: float, b: float, c: float, d: float):
     """Создает трапециевидную функцию принадлежности."""
-
-    def mu(x: float) -> float:
-        if x <= a:
-            return 0.0
-        elif a < x <= b:
-            return (x - a) / (b - a)
-        elif b < x <= c:
-            return 1.0
-        elif c < x <= d:
-            return (d - x) / (d - c)
-        else:
-            return 0.0
-
-    return mu
+    return TrapezoidalMembership(a, b, c, d)
 
 
 def setup_cs_fuzzy_system() -> FuzzyControlSystem:
@@ -262,7 +238,15 @@ def setup_cs_fuzzy_system() -> FuzzyControlSystem:
     return system
 
 
-def demonstrate_rule_evaluation(system: FuzzyControlSystem):
+def demonstrate_rule_evaluation(system: FuzzyControlSystem, processes: int = None):
+    """
+    Демонстрирует нечеткий вывод на примерах скинов.
+
+    Args:
+        system: система нечеткого управления
+        processes: если задано, результаты вывода для всех скинов считаются
+                   заранее пакетно в processes процессах (parallel_scoring)
+    """
     skins = create_sample_skins()
     
     print(f"\nСоздано {len(skins)} скинов:")
@@ -271,14 +255,18 @@ def demonstrate_rule_evaluation(system: FuzzyControlSystem):
 
     summary_data = []
 
-    for skin in skins:
+    results = None
+    if processes:
+        results = score_skins(system, skins, "Investment potential", processes)
+
+    for i, skin in enumerate(skins):
         print(f"\nАнализ скина: {skin.name}")
         
         inputs = {
             "Wear": skin.float_value,
             "Liquidity": skin.liquidity,
             "Price": skin.price,
-            "SkinAge": skin.age_days
+            "Age": skin.age_days
         }
         
         print(f"Параметры скина:")
@@ -298,9 +286,12 @@ def demonstrate_rule_evaluation(system: FuzzyControlSystem):
                     print(f"    - {term_name}: {degree:.3f}")
         
         # Вывод по Мамдани
-        result, universe, aggregated = system.infer_mamdani(
-            inputs, "Investment potential"
-        )
+        if results is not None:
+            result = results[i]
+        else:
+            result, universe, aggregated = system.infer_mamdani(
+                inputs, "Investment potential"
+            )
         
         print(f"Результат нечеткого вывода: {result:.3f}")
         
@@ -331,11 +322,9 @@ def demonstrate_rule_evaluation(system: FuzzyControlSystem):
             "Result": f"{result:.3f}",
         })
         
-    df = pd.DataFrame(summary_data)
-    
-    print(df.to_markdown(index=False))
-    
-    return df
+    from reporting import print_summary
+
+    return print_summary(summary_data)
 
 
 def main():
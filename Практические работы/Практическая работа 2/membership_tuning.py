@@ -0,0 +1,217 @@
+"""
+Настройка параметров функций принадлежности по размеченным данным.
+
+Параметры всех параметрических термов выбранных переменных собираются
+в один вектор. Вектор оптимизируется дифференциальной эволюцией: на каждом
+поколении для каждого кандидата популяции строится пробный вектор, и пробные
+векторы оцениваются параллельно пулом процессов. Каждый кандидат оценивается
+одним пакетным выводом (infer_mamdani_batch) по всему набору данных,
+ошибка — среднеквадратичная.
+
+Параметры, совпадающие с границами универсума (плечи крайних термов),
+не изменяются, поэтому термы по-прежнему покрывают всю область определения.
+"""
+
+import numpy as np
+from multiprocessing import Pool
+from typing import Dict, List, Sequence, Tuple
+from fuzzy_sets import FuzzySet, ParametricMembership
+from fuzzy_control_system import FuzzyControlSystem
+
+# Состояние процесса пула (задается в _init_worker)
+_worker = {}
+
+
+def _init_worker(tuner: "MembershipTuner", inputs: Dict[str, np.ndarray], targets):
+    _worker.update(tuner=tuner, inputs=inputs, targets=targets)
+
+
+def _evaluate(vector: np.ndarray) -> float:
+    return _worker["tuner"].loss(vector, _worker["inputs"], _worker["targets"])
+
+
+def _map_serial(fn, vectors: List[np.ndarray]) -> List[float]:
+    """Последовательная замена Pool.map при processes=1."""
+    return [fn(v) for v in vectors]
+
+
+class MembershipTuner:
+    """Настройка параметров термов системы дифференциальной эволюцией."""
+
+    def __init__(
+        self,
+        system: FuzzyControlSystem,
+        output_var_name: str,
+        var_names: Sequence[str] = None,
+        num_points: int = 100,
+    ):
+        """
+        Args:
+            system: система с параметрическими термами (изменяется методом apply)
+            output_var_name: имя выходной переменной, по которой считается ошибка
+            var_names: настраиваемые переменные (по умолчанию все входные и выход)
+            num_points: дискретизация выходного универсума при оценке
+        """
+        self.system = system
+        self.output_var_name = output_var_name
+        self.num_points = num_points
+        variables = {**system.input_vars, **system.output_vars}
+        if var_names is None:
+            var_names = list(system.input_vars) + [output_var_name]
+
+        # Разметка вектора: (имя переменной, имя терма, тип, начало, длина)
+        self.layout: List[Tuple[str, str, type, int, int]] = []
+        values, lower, upper, fixed = [], [], [], []
+        for var_name in var_names:
+            var = variables[var_name]
+            for term_name, term_set in var.terms.items():
+                mu_func = getattr(term_set, "mu_func", None)
+                if not isinstance(mu_func, ParametricMembership):
+                    continue
+                self.layout.append(
+                    (
+                        var_name,
+                        term_name,
+                        type(mu_func),
+                        len(values),
+                        len(mu_func.params),
+                    )
+                )
+                for p in mu_func.params:
+                    values.append(p)
+                    lower.append(min(var.domain_min, p))
+                    upper.append(max(var.domain_max, p))
+                    fixed.append(p <= var.domain_min or p >= var.domain_max)
+        if not self.layout:
+            raise ValueError("Нет параметрических термов для настройки")
+        self.initial = np.array(values, dtype=float)
+        self.lower = np.array(lower)
+        self.upper = np.array(upper)
+        self.fixed = np.array(fixed)
+        # Масштаб возмущений параметра — ширина носителя его терма
+        self.scale = np.empty_like(self.initial)
+        for _, _, _, start, length in self.layout:
+            block = self.initial[start : start + length]
+            self.scale[start : start + length] = max(block[-1] - block[0], 1e-12)
+
+    def vector(self) -> np.ndarray:
+        """Текущие параметры термов системы."""
+        variables = {**self.system.input_vars, **self.system.output_vars}
+        return np.concatenate(
+            [
+                variables[var_name].terms[term_name].mu_func.params
+                for var_name, term_name, _, _, _ in self.layout
+            ]
+        )
+
+    def repair(self, vector: np.ndarray) -> np.ndarray:
+        """
+        Приводит вектор к допустимому: параметры в границах универсума,
+        закрепленные параметры не изменены, параметры каждого терма упорядочены.
+        """
+        vector = np.clip(vector, self.lower, self.upper)
+        vector[self.fixed] = self.initial[self.fixed]
+        for _, _, _, start, length in self.layout:
+            vector[start : start + length].sort()
+        return vector
+
+    def apply(self, vector: np.ndarray, system: FuzzyControlSystem = None):
+        """Записывает параметры вектора в термы системы (по умолчанию self.system)."""
+        system = system or self.system
+        variables = {**system.input_vars, **system.output_vars}
+        for var_name, term_name, kind, start, length in self.layout:
+            var = variables[var_name]
+            params = vector[start : start + length].tolist()
+            # add_term заменяет терм с тем же именем и сбрасывает индексы переменной
+            var.add_term(FuzzySet(term_name, kind(*params)))
+
+    def loss(
+        self, vector: np.ndarray, inputs: Dict[str, np.ndarray], targets: np.ndarray
+    ) -> float:
+        """Среднеквадратичная ошибка системы с параметрами vector."""
+        self.apply(vector)
+        predicted = self.system.infer_mamdani_batch(
+            inputs, self.output_var_name, self.num_points
+        )
+        return float(np.mean((predicted - targets) ** 2))
+
+    def tune(
+        self,
+        inputs: Dict[str, np.ndarray],
+        targets: np.ndarray,
+        population: int = 16,
+        generations: int = 30,
+        mutation: float = 0.6,
+        crossover: float = 0.9,
+        sigma: float = 0.1,
+        processes: int = None,
+        seed: int = 0,
+        verbose: bool = False,
+    ) -> Tuple[np.ndarray, float, List[float]]:
+        """
+        Оптимизирует параметры и записывает лучшие в систему.
+
+        Args:
+            inputs: {имя_входной_переменной: массив значений}
+            targets: эталонные значения выхода
+            population: размер популяции (не меньше 4)
+            generations: число поколений
+            mutation: коэффициент мутации F дифференциальной эволюции
+            crossover: вероятность кроссовера CR
+            sigma: разброс начальной популяции в долях ширины термов
+            processes: число процессов (None — по числу ядер, 1 — без пула)
+            seed: зерно генератора
+            verbose: печатать лучшую ошибку каждого поколения
+
+        Returns:
+            (лучший вектор, его ошибка, лучшая ошибка по поколениям)
+        """
+        if population < 4:
+            raise ValueError("Размер популяции должен быть не меньше 4")
+        rng = np.random.default_rng(seed)
+        inputs = {name: np.asarray(v, dtype=float) for name, v in inputs.items()}
+        targets = np.asarray(targets, dtype=float)
+
+        start = self.repair(self.vector())
+        candidates = [start] + [
+            self.repair(start + rng.normal(0.0, sigma, start.shape) * self.scale)
+            for _ in range(population - 1)
+        ]
+        candidates = np.array(candidates)
+        dim = candidates.shape[1]
+
+        if processes == 1:
+            pool = None
+            _init_worker(self, inputs, targets)
+            evaluate = _map_serial
+        else:
+            pool = Pool(processes, _init_worker, (self, inputs, targets))
+            evaluate = pool.map
+        try:
+            losses = np.array(evaluate(_evaluate, list(candidates)))
+            history = [float(losses.min())]
+            for generation in range(generations):
+                trials = np.empty_like(candidates)
+                for i in range(population):
+                    others = [j for j in range(population) if j != i]
+                    a, b, c = candidates[rng.choice(others, 3, replace=False)]
+                    mutant = a + mutation * (b - c)
+                    mask = rng.random(dim) < crossover
+                    mask[rng.integers(dim)] = True
+                    trials[i] = self.repair(np.where(mask, mutant, candidates[i]))
+                trial_losses = np.array(evaluate(_evaluate, list(trials)))
+                better = trial_losses < losses
+                candidates[better] = trials[better]
+                losses[better] = trial_losses[better]
+                history.append(float(losses.min()))
+                if verbose:
+                    print(f"Поколение {generation + 1}: MSE = {history[-1]:.6f}")
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+            _worker.clear()
+
+        best = int(losses.argmin())
+        self.apply(candidates[best])
+        return candidates[best], float(losses[best]), history
@@ -0,0 +1,145 @@
+"""
+Параллельная оценка каталога скинов пакетным выводом Мамдани.
+
+Каталог делится на блоки, которые обрабатываются пулом процессов.
+Входы и выходы передаются через разделяемую память: каждый процесс читает
+свой диапазон строк входной матрицы и пишет результаты в тот же диапазон
+выходного массива, поэтому порядок результатов совпадает с порядком входов.
+Система передается каждому процессу один раз при его запуске.
+"""
+
+import numpy as np
+from multiprocessing import Pool, shared_memory
+from typing import List, Sequence, Tuple
+from fuzzy_control_system import FuzzyControlSystem
+
+
+# Состояние процесса пула (задается в _init_worker)
+_worker = {}
+
+
+def _init_worker(
+    system: FuzzyControlSystem,
+    var_names: List[str],
+    output_var_name: str,
+    num_points: int,
+    inputs_name: str,
+    outputs_name: str,
+    shape: Tuple[int, int],
+):
+    inputs_shm = shared_memory.SharedMemory(name=inputs_name)
+    outputs_shm = shared_memory.SharedMemory(name=outputs_name)
+    _worker.update(
+        system=system,
+        var_names=var_names,
+        output_var_name=output_var_name,
+        num_points=num_points,
+        # Ссылки на сегменты держим, пока живет процесс
+        shm=(inputs_shm, outputs_shm),
+        inputs=np.ndarray(shape, dtype=np.float64, buffer=inputs_shm.buf),
+        outputs=np.ndarray(shape[0], dtype=np.float64, buffer=outputs_shm.buf),
+    )
+
+
+def _score_range(bounds: Tuple[int, int]) -> int:
+    start, stop = bounds
+    block = _worker["inputs"][start:stop]
+    values = {name: block[:, j] for j, name in enumerate(_worker["var_names"])}
+    _worker["outputs"][start:stop] = _worker["system"].infer_mamdani_batch(
+        values, _worker["output_var_name"], _worker["num_points"]
+    )
+    return stop - start
+
+
+def score_catalog(
+    system: FuzzyControlSystem,
+    inputs: np.ndarray,
+    var_names: Sequence[str],
+    output_var_name: str,
+    processes: int = None,
+    chunk_size: int = 2048,
+    num_points: int = 100,
+) -> np.ndarray:
+    """
+    Оценивает каталог входов в нескольких процессах.
+
+    Args:
+        system: система нечеткого управления (должна сериализоваться pickle,
+                т.е. термы заданы параметрическими функциями принадлежности)
+        inputs: матрица входов формы (число объектов, число переменных)
+        var_names: имена входных переменных, соответствующие столбцам inputs
+        output_var_name: имя выходной переменной
+        processes: число процессов (None — по числу ядер, 1 — без пула)
+        chunk_size: число строк в одном задании
+        num_points: дискретизация выходного универсума
+
+    Returns:
+        Массив четких значений выхода в порядке строк inputs
+    """
+    inputs = np.ascontiguousarray(inputs, dtype=np.float64)
+    if inputs.ndim != 2 or inputs.shape[1] != len(var_names):
+        raise ValueError("Число столбцов inputs должно совпадать с числом переменных")
+
+    n = inputs.shape[0]
+    if processes == 1 or n <= chunk_size:
+        values = {name: inputs[:, j] for j, name in enumerate(var_names)}
+        return system.infer_mamdani_batch(values, output_var_name, num_points)
+
+    inputs_shm = shared_memory.SharedMemory(create=True, size=max(inputs.nbytes, 1))
+    outputs_shm = None
+    # Представления сегментов удаляются до close(): иначе при исключении
+    # close() падает с BufferError, скрывая исходную ошибку и не освобождая память
+    shared_inputs = shared_outputs = None
+    try:
+        outputs_shm = shared_memory.SharedMemory(create=True, size=max(n * 8, 1))
+        shared_inputs = np.ndarray(inputs.shape, dtype=np.float64, buffer=inputs_shm.buf)
+        shared_inputs[:] = inputs
+        shared_outputs = np.ndarray(n, dtype=np.float64, buffer=outputs_shm.buf)
+
+        ranges = [(start, min(start + chunk_size, n)) for start in range(0, n, chunk_size)]
+        initargs = (
+            system,
+            list(var_names),
+            output_var_name,
+            num_points,
+            inputs_shm.name,
+            outputs_shm.name,
+            inputs.shape,
+        )
+        with Pool(processes, initializer=_init_worker, initargs=initargs) as pool:
+            for _ in pool.imap_unordered(_score_range, ranges):
+                pass
+
+        result = shared_outputs.copy()
+    finally:
+        del shared_inputs, shared_outputs
+        for shm in (inputs_shm, outputs_shm):
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+    return result
+
+
+def skins_to_inputs(skins) -> Tuple[np.ndarray, List[str]]:
+    """Преобразует список скинов в матрицу входов системы из main.py."""
+    var_names = ["Wear", "Liquidity", "Price", "Age"]
+    inputs = np.array(
+        [[s.float_value, s.liquidity, s.price, s.age_days] for s in skins],
+        dtype=np.float64,
+    ).reshape(len(skins), len(var_names))
+    return inputs, var_names
+
+
+def score_skins(
+    system: FuzzyControlSystem,
+    skins,
+    output_var_name: str = "Investment potential",
+    processes: int = None,
+    chunk_size: int = 2048,
+    num_points: int = 100,
+) -> np.ndarray:
+    """Параллельная замена цикла infer_mamdani по списку скинов."""
+    inputs, var_names = skins_to_inputs(skins)
+    return score_catalog(
+        system, inputs, var_names, output_var_name, processes, chunk_size, num_points
+    )
@@ -0,0 +1,73 @@
+"""
+Визуализация нечетких множеств и лингвистических переменных.
+
+Модуль импортируется лениво из методов plot, plot_continuous и plot_terms,
+поэтому ядро вывода не зависит от matplotlib.
+"""
+
+from typing import Tuple
+import numpy as np
+import matplotlib.pyplot as plt
+
+
+def plot_discrete_set(fuzzy_set):
+    """Визуализация дискретного множества."""
+    if fuzzy_set.data_type != "discrete":
+        print(f"Множество {fuzzy_set.name} не является дискретным для визуализации")
+        return
+
+    elements = fuzzy_set.get_elements()
+    values = fuzzy_set.get_values()
+
+    plt.figure(figsize=(10, 5))
+    plt.bar(range(len(elements)), values)
+    plt.xticks(range(len(elements)), elements, rotation=45, ha="right")
+    plt.ylim(0, 1)
+    plt.ylabel("μ")
+    plt.title(fuzzy_set.name)
+    plt.tight_layout()
+    plt.show()
+
+
+def plot_continuous_set(
+    fuzzy_set, x_range: Tuple[float, float] = None, num_points: int = 200
+):
+    """Визуализация непрерывной функции принадлежности."""
+    if fuzzy_set.data_type != "continuous":
+        print(f"Множество {fuzzy_set.name} не является непрерывным")
+        return
+
+    if x_range is None:
+        x_min, x_max = -10, 10
+    else:
+        x_min, x_max = x_range
+
+    x = np.linspace(x_min, x_max, num_points)
+    y = [fuzzy_set.mu(xi) for xi in x]
+
+    plt.figure(figsize=(10, 5))
+    plt.plot(x, y, "b-", linewidth=2)
+    plt.fill_between(x, 0, y, alpha=0.3)
+    plt.xlabel("x")
+    plt.ylabel("μ(x)")
+    plt.title(f"Функция принадлежности: {fuzzy_set.name}")
+    plt.grid(True, alpha=0.3)
+    plt.ylim(0, 1.1)
+    plt.show()
+
+
+def plot_variable_terms(variable, title: str = None):
+    """Визуализация всех терминов лингвистической переменной"""
+    x = variable.universe()
+    plt.figure(figsize=(10, 6))
+
+    for term_name, term_set in variable.terms.items():
+        y = term_set.mu_array(x)
+        plt.plot(x, y, label=term_name, linewidth=2)
+
+    plt.xlabel("Значение")
+    plt.ylabel("Степень принадлежности μ")
+    plt.title(title or f"Термы лингвистической переменной '{variable.name}'")
+    plt.legend()
+    plt.grid(True, alpha=0.3)
+    plt.show()
@@ -1,4 +1,5 @@
 from typing import List
+import numpy as np
 
 
 class FuzzyRelation:
@@ -57,3 +58,25 @@ class FuzzyRelation:
             matrix=complemented_matrix,
             name=f"Дополнение: {self.name}",
         )
+
+    def compose(self, other: "FuzzyRelation") -> "FuzzyRelation":
+        """
+        Max-min композиция отношений: T[i][j] = max_k min(R[i][k], S[k][j]).
+        Вычисляется построчно векторно, память O(p x m) на строку.
+        """
+        if self.columns != other.rows:
+            raise ValueError("Несовместимые отношения для композиции")
+
+        left = np.asarray(self.matrix, dtype=float).reshape(len(self.rows), -1)
+        right = np.asarray(other.matrix, dtype=float).reshape(len(other.rows), -1)
+        result = np.zeros((left.shape[0], right.shape[1]))
+        if left.shape[1] > 0:
+            for i in range(left.shape[0]):
+                result[i] = np.minimum(left[i][:, None], right).max(axis=0)
+
+        return FuzzyRelation(
+            rows=self.rows,
+            columns=other.columns,
+            matrix=result.tolist(),
+            name=f"({self.name}) ∘ ({other.name})",
+        )
@@ -0,0 +1,17 @@
+"""
+Табличные отчеты по результатам нечеткого вывода.
+
+Модуль импортируется лениво, поэтому ядро вывода не зависит от pandas.
+"""
+
+from typing import Dict, List
+import pandas as pd
+
+
+def print_summary(summary_data: List[Dict[str, str]]) -> pd.DataFrame:
+    """Печатает сводную таблицу в формате Markdown и возвращает ее."""
+    df = pd.DataFrame(summary_data)
+
+    print(df.to_markdown(index=False))
+
+    return df
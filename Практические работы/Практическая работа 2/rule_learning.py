@@ -0,0 +1,142 @@
+"""
+Генерация базы правил по данным методом Ванга-Менделя.
+
+Для каждого примера в каждой переменной выбирается терм с наибольшей
+степенью принадлежности; набор номеров термов задает правило, а произведение
+степеней — его вес. Правила с одинаковыми условиями, но разными заключениями
+(конфликты) разрешаются по суммарному весу заключения.
+
+Данные обрабатываются порциями за один проход: порция фазифицируется
+векторно, наборы номеров термов кодируются одним целым числом
+(смешанная система счисления) и группируются через np.unique. Между
+порциями хранятся только накопленные веса различных правил, поэтому память
+не зависит от объема данных.
+"""
+
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+from linguistic_variable import LinguisticVariable
+from fuzzy_rules import FuzzyRule, RuleBase
+
+
+def iter_chunks(
+    inputs: Dict[str, np.ndarray], outputs: np.ndarray, chunk_size: int = 65536
+) -> Iterable[Tuple[Dict[str, np.ndarray], np.ndarray]]:
+    """Разбивает массивы входов и выходов на порции для WangMendelLearner.fit."""
+    outputs = np.asarray(outputs, dtype=float)
+    for offset in range(0, len(outputs), chunk_size):
+        yield (
+            {
+                name: np.asarray(values[offset : offset + chunk_size], dtype=float)
+                for name, values in inputs.items()
+            },
+            outputs[offset : offset + chunk_size],
+        )
+
+
+class WangMendelLearner:
+    """Потоковый генератор правил Ванга-Менделя."""
+
+    def __init__(
+        self,
+        input_vars: List[LinguisticVariable],
+        output_var: LinguisticVariable,
+    ):
+        """
+        Args:
+            input_vars: входные переменные с заданными термами (порядок условий)
+            output_var: выходная переменная с заданными термами
+        """
+        self.input_vars = list(input_vars)
+        self.output_var = output_var
+        self.variables = self.input_vars + [output_var]
+        self.term_names = [list(var.terms) for var in self.variables]
+        self.radix = [len(names) for names in self.term_names]
+        if 0 in self.radix:
+            raise ValueError("У всех переменных должен быть хотя бы один терм")
+        # {код набора термов (условия + заключение): суммарный вес}
+        self.weights: Dict[int, float] = {}
+        self.samples_seen = 0
+        self.samples_used = 0
+
+    def _best_terms(self, var: LinguisticVariable, values: np.ndarray):
+        """Номера термов с наибольшей степенью и сами степени для массива значений."""
+        degrees = np.stack([fs.mu_array(values) for fs in var.terms.values()], axis=1)
+        best = degrees.argmax(axis=1)
+        return best, degrees[np.arange(len(values)), best]
+
+    def partial_fit(self, inputs: Dict[str, np.ndarray], outputs: np.ndarray):
+        """
+        Учитывает порцию данных.
+
+        Args:
+            inputs: {имя_входной_переменной: массив значений}
+            outputs: массив значений выходной переменной той же длины
+        """
+        columns = [np.asarray(inputs[var.name], dtype=float) for var in self.input_vars]
+        columns.append(np.asarray(outputs, dtype=float))
+
+        indices = []
+        weight = np.ones(len(columns[-1]))
+        for var, values in zip(self.variables, columns):
+            best, degree = self._best_terms(var, values)
+            indices.append(best)
+            weight *= degree
+
+        self.samples_seen += len(weight)
+        # Примеры вне носителей всех термов какой-либо переменной не дают правил
+        used = weight > 0
+        if not np.any(used):
+            return self
+        codes = np.ravel_multi_index([i[used] for i in indices], self.radix)
+        unique, inverse = np.unique(codes, return_inverse=True)
+        sums = np.bincount(inverse, weights=weight[used])
+        for code, total in zip(unique.tolist(), sums.tolist()):
+            self.weights[code] = self.weights.get(code, 0.0) + total
+        self.samples_used += int(np.count_nonzero(used))
+        return self
+
+    def fit(self, chunks: Iterable[Tuple[Dict[str, np.ndarray], np.ndarray]]):
+        """Учитывает поток порций (inputs, outputs), например из iter_chunks."""
+        for inputs, outputs in chunks:
+            self.partial_fit(inputs, outputs)
+        return self
+
+    def resolve(self, min_weight: float = 0.0) -> List[Tuple[Tuple[int, ...], float]]:
+        """
+        Разрешает конфликты: для каждого набора условий оставляет заключение
+        с наибольшим суммарным весом.
+
+        Returns:
+            Список (номера термов входов + номер терма выхода, вес) по порядку кодов
+        """
+        num_out = self.radix[-1]
+        best: Dict[int, Tuple[int, float]] = {}
+        for code, total in self.weights.items():
+            antecedent, consequent = divmod(code, num_out)
+            if antecedent not in best or total > best[antecedent][1]:
+                best[antecedent] = (consequent, total)
+        result = []
+        for antecedent in sorted(best):
+            consequent, total = best[antecedent]
+            if total > min_weight:
+                terms = np.unravel_index(antecedent * num_out + consequent, self.radix)
+                result.append((tuple(int(t) for t in terms), total))
+        return result
+
+    def rule_base(self, min_weight: float = 0.0, prefix: str = "WM") -> RuleBase:
+        """
+        Формирует базу правил.
+
+        Args:
+            min_weight: правила с суммарным весом не выше порога отбрасываются
+            prefix: префикс имен правил
+        """
+        rule_base = RuleBase()
+        for number, (terms, _) in enumerate(self.resolve(min_weight), 1):
+            rule = FuzzyRule(f"{prefix}{number}")
+            for var, names, t in zip(self.input_vars, self.term_names, terms):
+                rule.add_condition(var.name, names[t], "AND")
+            rule.set_conclusion(self.output_var.name, self.term_names[-1][terms[-1]])
+            rule_base.add_rule(rule)
+        return rule_base
@@ -0,0 +1,176 @@
+"""
+Минимизация базы правил без изменения выхода системы.
+
+Удаляются:
+- правила без условий и без заключения (их активация или вклад всегда 0);
+- правила, которые не могут сработать: два AND-условия на одну переменную
+  с непересекающимися носителями термов или условие на несуществующий терм;
+- дубликаты: правила с тем же набором AND-условий и тем же заключением;
+- поглощенные правила Мамдани: если условия правила A — подмножество условий
+  правила B с тем же заключением, то активация A не меньше активации B
+  (минимум по меньшему числу степеней), и при аккумуляции максимумом
+  правило B ничего не добавляет.
+Повторяющиеся условия внутри правила сливаются в одно.
+
+Правила с TSK-заключением (в том числе вместе с заключением Мамдани)
+участвуют только в первых двух пунктах: выход TSK — взвешенное среднее,
+и удаление даже полного дубликата изменило бы веса.
+"""
+
+from typing import Any, Dict, FrozenSet, List, Tuple
+from linguistic_variable import LinguisticVariable
+from fuzzy_rules import FuzzyRule, RuleBase
+
+
+def _positive_interval(var: LinguisticVariable, term_name: str):
+    """Отрезок, вне которого степень принадлежности терма заведомо равна 0."""
+    support = var.terms[term_name].support
+    if support is None:
+        return var.domain_min, var.domain_max
+    return support
+
+
+def can_fire(rule: FuzzyRule, variables: Dict[str, LinguisticVariable]) -> bool:
+    """
+    Проверяет, может ли правило иметь ненулевую активацию.
+    Переменные, отсутствующие в variables, считаются допускающими любой терм.
+    """
+    if not rule.conditions:
+        return False
+    by_var: Dict[str, set] = {}
+    for var_name, term_name, connective in rule.conditions:
+        if connective == "AND":
+            by_var.setdefault(var_name, set()).add(term_name)
+    for var_name, term_names in by_var.items():
+        var = variables.get(var_name)
+        if var is None:
+            continue
+        if any(term_name not in var.terms for term_name in term_names):
+            return False
+        intervals = [_positive_interval(var, t) for t in term_names]
+        # Пересечение отрезков пусто, если наибольшее начало правее наименьшего конца
+        if max(lo for lo, _ in intervals) > min(hi for _, hi in intervals):
+            return False
+    return True
+
+
+def _condition_key(rule: FuzzyRule) -> FrozenSet[Tuple[str, str]]:
+    return frozenset(
+        (var_name, term_name)
+        for var_name, term_name, connective in rule.conditions
+        if connective == "AND"
+    )
+
+
+def _conclusion_key(rule: FuzzyRule):
+    """Пара (заключение Мамдани, TSK-заключение); None, если заключений нет."""
+    tsk = None
+    if rule.tsk_conclusion:
+        var_name, constant, coefficients = rule.tsk_conclusion
+        tsk = (var_name, constant, tuple(sorted(coefficients.items())))
+    if not rule.conclusion and tsk is None:
+        return None
+    return (rule.conclusion or None, tsk)
+
+
+def _mamdani_only(conclusion) -> bool:
+    """Правило только с заключением Мамдани: его можно удалять как дубликат."""
+    mamdani, tsk = conclusion
+    return mamdani is not None and tsk is None
+
+
+def _merge_conditions(rule: FuzzyRule) -> int:
+    """Сливает повторяющиеся условия правила; возвращает число удаленных."""
+    unique = list(dict.fromkeys(rule.conditions))
+    removed = len(rule.conditions) - len(unique)
+    rule.conditions = unique
+    return removed
+
+
+def minimize_rule_base(
+    rule_base: RuleBase, variables: Dict[str, LinguisticVariable] = None
+) -> Dict[str, Any]:
+    """
+    Минимизирует базу правил на месте.
+
+    Args:
+        rule_base: база правил
+        variables: {имя: LinguisticVariable} для проверки пересечения носителей;
+                   без них проверка невыполнимых правил пропускается
+
+    Returns:
+        Отчет: число правил до и после, число удаленных правил по причинам,
+        число слитых условий и имена удаленных правил по причинам
+    """
+    variables = variables or {}
+    removed: Dict[str, List[str]] = {
+        "empty": [],
+        "never_fires": [],
+        "duplicate": [],
+        "subsumed": [],
+    }
+    before = len(rule_base.rules)
+    merged_conditions = 0
+
+    kept: List[FuzzyRule] = []
+    seen = set()
+    # {заключение: наборы условий оставленных правил Мамдани}
+    conditions_by_conclusion: Dict[Any, List[FrozenSet[Tuple[str, str]]]] = {}
+    for rule in rule_base.rules:
+        conclusion = _conclusion_key(rule)
+        if not rule.conditions or conclusion is None:
+            removed["empty"].append(rule.name)
+            continue
+        if not can_fire(rule, variables):
+            removed["never_fires"].append(rule.name)
+            continue
+        merged_conditions += _merge_conditions(rule)
+        if _mamdani_only(conclusion):
+            conditions = _condition_key(rule)
+            key = (conditions, conclusion)
+            if key in seen:
+                removed["duplicate"].append(rule.name)
+                continue
+            seen.add(key)
+            conditions_by_conclusion.setdefault(conclusion, []).append(conditions)
+        kept.append(rule)
+
+    # Поглощение: среди оставленных правил с тем же заключением ищем
+    # правило, условия которого — собственное подмножество условий данного
+    result = []
+    for rule in kept:
+        conclusion = _conclusion_key(rule)
+        if _mamdani_only(conclusion):
+            conditions = _condition_key(rule)
+            if any(
+                other < conditions for other in conditions_by_conclusion[conclusion]
+            ):
+                removed["subsumed"].append(rule.name)
+                continue
+        result.append(rule)
+
+    rule_base.rules = result
+    rule_base.reindex()
+    return {
+        "rules_before": before,
+        "rules_after": len(result),
+        "removed": {reason: len(names) for reason, names in removed.items()},
+        "merged_conditions": merged_conditions,
+        "removed_rules": removed,
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    """Выводит отчет minimize_rule_base."""
+    before, after = report["rules_before"], report["rules_after"]
+    saved = 1 - after / before if before else 0.0
+    print(f"\nМинимизация базы правил: {before} -> {after} правил ({saved:.0%} меньше)")
+    reasons = {
+        "empty": "без условий или заключения",
+        "never_fires": "никогда не срабатывают",
+        "duplicate": "дубликаты",
+        "subsumed": "поглощены более общими",
+    }
+    for reason, title in reasons.items():
+        print(f"  {title}: {report['removed'][reason]}")
+    print(f"  слито повторяющихся условий: {report['merged_conditions']}")
@@ -0,0 +1,213 @@
+"""
+Локальный asyncio-сервис оценки инвестиционной привлекательности.
+
+Протокол — JSON по строкам через TCP или Unix-сокет.
+Запрос:  {"id": 1, "inputs": {"Wear": 0.05, "Liquidity": 650, "Price": 500, "Age": 100}}
+Ответ:   {"id": 1, "result": 0.85}  или  {"id": 1, "error": "..."}
+
+Одновременные запросы собираются в микропакеты (не более max_batch_size
+запросов или не дольше max_delay секунд ожидания) и оцениваются одним
+пакетным выводом Мамдани. Ответы по соединению могут приходить не по порядку,
+их сопоставляют по id.
+
+Запуск: python scoring_server.py [--port 8765 | --unix /tmp/fuzzy.sock] [--spec system.json]
+"""
+
+import argparse
+import asyncio
+import json
+import numpy as np
+from typing import Callable, Dict, List, Tuple
+
+
+class MicroBatcher:
+    """Собирает одиночные запросы в пакеты и разрешает их futures."""
+
+    def __init__(
+        self,
+        score_batch: Callable[[Dict[str, np.ndarray]], np.ndarray],
+        var_names: List[str],
+        max_batch_size: int = 256,
+        max_delay: float = 0.002,
+    ):
+        """
+        Args:
+            score_batch: функция пакетной оценки {переменная: массив} -> массив
+            var_names: имена входных переменных
+            max_batch_size: максимальный размер пакета
+            max_delay: максимальное ожидание добора пакета после первого запроса, с
+        """
+        self.score_batch = score_batch
+        self.var_names = list(var_names)
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._queue: asyncio.Queue = None
+        self._task: asyncio.Task = None
+        self.batches = 0  # число выполненных пакетов
+        self.requests = 0  # число обработанных запросов
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, inputs: Dict[str, float]) -> float:
+        """Ставит запрос в очередь и ждет его результата."""
+        row = [float(inputs[name]) for name in self.var_names]
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[List[float], asyncio.Future]]:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_delay
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            rows = np.array([row for row, _ in batch], dtype=float)
+            values = {name: rows[:, j] for j, name in enumerate(self.var_names)}
+            try:
+                # Вывод выполняется в пуле потоков, чтобы цикл событий
+                # продолжал принимать запросы следующего пакета
+                results = await loop.run_in_executor(None, self.score_batch, values)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(float(result))
+            self.batches += 1
+            self.requests += len(batch)
+
+
+async def _handle_request(batcher: MicroBatcher, line: bytes, writer):
+    request_id = None
+    try:
+        request = json.loads(line)
+        request_id = request.get("id")
+        response = {"id": request_id, "result": await batcher.submit(request["inputs"])}
+    except Exception as e:
+        response = {"id": request_id, "error": f"{type(e).__name__}: {e}"}
+    writer.write(json.dumps(response).encode() + b"\n")
+
+
+async def _handle_connection(batcher: MicroBatcher, reader, writer):
+    tasks = set()
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if not line.strip():
+                continue
+            task = asyncio.create_task(_handle_request(batcher, line, writer))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+        await writer.drain()
+    finally:
+        writer.close()
+
+
+async def serve(
+    system,
+    output_var_name: str = "Investment potential",
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    unix_path: str = None,
+    max_batch_size: int = 256,
+    max_delay: float = 0.002,
+    num_points: int = 100,
+):
+    """Запускает сервис и обслуживает соединения до отмены."""
+    var_names = list(system.input_vars)
+
+    def score_batch(values: Dict[str, np.ndarray]) -> np.ndarray:
+        return system.infer_mamdani_batch(values, output_var_name, num_points)
+
+    batcher = MicroBatcher(score_batch, var_names, max_batch_size, max_delay)
+    batcher.start()
+
+    def on_connect(reader, writer):
+        return _handle_connection(batcher, reader, writer)
+
+    if unix_path:
+        server = await asyncio.start_unix_server(on_connect, path=unix_path)
+        address = unix_path
+    else:
+        server = await asyncio.start_server(on_connect, host, port)
+        address = f"{host}:{port}"
+    print(f"Сервис оценки слушает {address} (переменные: {', '.join(var_names)})")
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await batcher.stop()
+        if batcher.batches:
+            print(
+                f"Обработано {batcher.requests} запросов в {batcher.batches} пакетах "
+                f"(в среднем {batcher.requests / batcher.batches:.1f} на пакет)"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сервис оценки нечетким выводом")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="путь Unix-сокета вместо TCP")
+    parser.add_argument("--spec", help="JSON-спецификация системы (fuzzy_spec)")
+    parser.add_argument("--output", default="Investment potential")
+    parser.add_argument("--max-batch-size", type=int, default=256)
+    parser.add_argument("--max-delay-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    if args.spec:
+        from fuzzy_spec import load_spec
+
+        system = load_spec(args.spec)
+    else:
+        from main import setup_cs_fuzzy_system
+
+        system = setup_cs_fuzzy_system()
+
+    try:
+        asyncio.run(
+            serve(
+                system,
+                args.output,
+                args.host,
+                args.port,
+                args.unix,
+                args.max_batch_size,
+                args.max_delay_ms / 1000,
+            )
+        )
+    except KeyboardInterrupt:
+        print("Сервис остановлен")
+
+
+if __name__ == "__main__":
+    main()
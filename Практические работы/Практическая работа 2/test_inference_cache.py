@@ -0,0 +1,46 @@
+"""Кэш результатов вывода: сброс при замене базы правил."""
+
+from fuzzy_control_system import FuzzyControlSystem
+from fuzzy_rules import FuzzyRule, RuleBase
+from fuzzy_sets import FuzzySet, TriangularMembership
+from linguistic_variable import LinguisticVariable
+
+
+def make_system():
+    system = FuzzyControlSystem()
+    x = LinguisticVariable("x", 0.0, 1.0, 101)
+    x.add_term(FuzzySet("low", TriangularMembership(-1.0, 0.0, 1.0)))
+    x.add_term(FuzzySet("high", TriangularMembership(0.0, 1.0, 2.0)))
+    system.add_input_variable(x)
+    y = LinguisticVariable("y", 0.0, 1.0, 101)
+    y.add_term(FuzzySet("low", TriangularMembership(-0.5, 0.0, 0.5)))
+    y.add_term(FuzzySet("high", TriangularMembership(0.5, 1.0, 1.5)))
+    system.add_output_variable(y)
+    return system
+
+
+def make_rule_base(low_to, high_to):
+    rule_base = RuleBase()
+    for term, conclusion in (("low", low_to), ("high", high_to)):
+        rule = FuzzyRule()
+        rule.add_condition("x", term)
+        rule.set_conclusion("y", conclusion)
+        rule_base.add_rule(rule)
+    return rule_base
+
+
+def test_cache_invalidated_by_rule_base_replacement():
+    system = make_system()
+    system.rule_base = make_rule_base("low", "high")
+    system.enable_cache()
+    before = system.infer_mamdani({"x": 0.2}, "y")[0]
+
+    # Та же длина и тот же счетчик version, но противоположные заключения
+    replacement = make_rule_base("high", "low")
+    assert replacement.version == system.rule_base.version
+    system.rule_base = replacement
+    after = system.infer_mamdani({"x": 0.2}, "y")[0]
+
+    system.disable_cache()
+    assert after == system.infer_mamdani({"x": 0.2}, "y")[0]
+    assert after != before
@@ -0,0 +1,78 @@
+"""Минимизация базы правил не меняет выход TSK и Мамдани."""
+
+import numpy as np
+from fuzzy_control_system import FuzzyControlSystem
+from fuzzy_rules import FuzzyRule
+from fuzzy_sets import FuzzySet, TriangularMembership
+from linguistic_variable import LinguisticVariable
+
+
+def make_system():
+    system = FuzzyControlSystem()
+    x = LinguisticVariable("x", 0.0, 1.0, 101)
+    x.add_term(FuzzySet("low", TriangularMembership(-1.0, 0.0, 1.0)))
+    x.add_term(FuzzySet("high", TriangularMembership(0.0, 1.0, 2.0)))
+    system.add_input_variable(x)
+    z = LinguisticVariable("z", 0.0, 1.0, 101)
+    z.add_term(FuzzySet("low", TriangularMembership(-1.0, 0.0, 1.0)))
+    z.add_term(FuzzySet("high", TriangularMembership(0.0, 1.0, 2.0)))
+    system.add_input_variable(z)
+    y = LinguisticVariable("y", 0.0, 1.0, 101)
+    y.add_term(FuzzySet("low", TriangularMembership(-0.5, 0.0, 0.5)))
+    y.add_term(FuzzySet("high", TriangularMembership(0.5, 1.0, 1.5)))
+    system.add_output_variable(y)
+    return system
+
+
+def add_rule(system, conditions, conclusion, constant, coefficients):
+    rule = FuzzyRule()
+    for var_name, term_name in conditions:
+        rule.add_condition(var_name, term_name)
+    rule.set_conclusion("y", conclusion)
+    rule.set_tsk_conclusion("y", constant, coefficients)
+    system.add_rule(rule)
+
+
+def test_rules_with_different_tsk_conclusions_are_kept():
+    system = make_system()
+    # Одинаковые условия и заключение Мамдани, разные коэффициенты TSK
+    add_rule(system, [("x", "low")], "low", 0.1, {"x": 0.5})
+    add_rule(system, [("x", "low")], "low", 0.3, {"x": -0.2})
+    # Поглощаемое по Мамдани правило с собственным TSK-заключением
+    add_rule(system, [("x", "low"), ("z", "high")], "low", 0.9, {"z": 1.0})
+    add_rule(system, [("x", "high")], "high", 0.8, {})
+
+    inputs = {"x": np.linspace(0.0, 1.0, 21), "z": np.linspace(1.0, 0.0, 21)}
+    tsk_before = system.infer_tsk_batch(inputs, "y")
+    mamdani_before = system.infer_mamdani_batch(inputs, "y")
+
+    report = system.minimize_rules()
+
+    assert report["rules_after"] == 4
+    np.testing.assert_array_equal(system.infer_tsk_batch(inputs, "y"), tsk_before)
+    np.testing.assert_array_equal(
+        system.infer_mamdani_batch(inputs, "y"), mamdani_before
+    )
+
+
+def test_mamdani_duplicates_and_subsumed_rules_are_removed():
+    system = make_system()
+    for conditions, conclusion in (
+        ([("x", "low")], "low"),
+        ([("x", "low")], "low"),
+        ([("x", "low"), ("z", "high")], "low"),
+        ([("x", "high")], "high"),
+    ):
+        rule = FuzzyRule()
+        for var_name, term_name in conditions:
+            rule.add_condition(var_name, term_name)
+        rule.set_conclusion("y", conclusion)
+        system.add_rule(rule)
+
+    inputs = {"x": np.linspace(0.0, 1.0, 21), "z": np.linspace(1.0, 0.0, 21)}
+    before = system.infer_mamdani_batch(inputs, "y")
+    report = system.minimize_rules()
+
+    assert report["removed"]["duplicate"] == 1
+    assert report["removed"]["subsumed"] == 1
+    np.testing.assert_array_equal(system.infer_mamdani_batch(inputs, "y"), before)
@@ -3,17 +3,33 @@ import numpy as np
 import torch
 import torch.nn as nn
 import torch.optim as optim
-from collections import deque
 from model import QNetwork
+from replay_buffer import ReplayBuffer, PrioritizedReplayBuffer
+
+
+def set_torch_threads(num_threads=1):
+    """
+    Число потоков torch для маленькой сети.
+
+    Для MLP 12-128-128-64-3 накладные расходы на синхронизацию потоков
+    больше самих вычислений, поэтому один поток быстрее и при выборе действий,
+    и при обучении на батче из 64 переходов.
+    """
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(num_threads)
+    except RuntimeError:
+        pass  # Задается только до первой параллельной операции torch
 
 
 class DQNAgent:
-    def __init__(self, state_dim, action_dim):
+    def __init__(self, state_dim, action_dim, prioritized=False):
         '''
         Docstring для __init__
         
         :param state_dim: размер вектора состояния
         :param action_dim: количество возможных действий
+        :param prioritized: приоритетный выбор опыта по TD-ошибке (по умолчанию равномерный)
         '''
         self.state_dim = state_dim
         self.action_dim = action_dim
@@ -34,22 +50,65 @@ class DQNAgent:
         self.target_update_freq = 10  # Частота обновления целевой сети
 
         # Ограниченная память
-        self.memory = deque(maxlen=20000) # Буфер опыта
+        self.prioritized = prioritized
+        if prioritized:
+            self.memory = PrioritizedReplayBuffer(20000, state_dim) # Буфер опыта с деревом сумм приоритетов
+        else:
+            self.memory = ReplayBuffer(20000, state_dim) # Буфер опыта: кольцевой буфер на массивах NumPy
         self.train_step_counter = 0 # Счётчик шагов обучения
 
+        # Выбор действий: переиспользуемый входной тензор и его представление NumPy (общая память)
+        self._state_buffer = torch.zeros(1, state_dim)
+        self._state_array = self._state_buffer.numpy()
+        self.acting_net = self.policy_net # Сеть для выбора действий (см. optimize_acting)
+
+    def optimize_acting(self, mode="trace"):
+        """
+        Выбор реализации сети для выбора действий.
+
+        :param mode: "trace" — torch.jit.trace, "script" — torch.jit.script,
+                     "eager" — обычный модуль policy_net
+        Скомпилированный модуль использует те же тензоры параметров, что и policy_net,
+        поэтому обновления весов при обучении сразу учитываются при выборе действий.
+        """
+        if mode == "trace":
+            self.acting_net = torch.jit.trace(self.policy_net, self._state_buffer)
+        elif mode == "script":
+            self.acting_net = torch.jit.script(self.policy_net)
+        elif mode == "eager":
+            self.acting_net = self.policy_net
+        else:
+            raise ValueError(f"Неизвестный режим: {mode}")
+        return self.acting_net
+
     def choose_action(self, state, training=True):
         """Выбор действия с epsilon-greedy стратегией"""
         if training and np.random.random() < self.epsilon:
             return random.randint(0, self.action_dim - 1) # Случайное действие из допустимых
 
-        state_tensor = torch.FloatTensor(state).unsqueeze(0) # Преобразование состояния
-        with torch.no_grad(): # Отключение вычисления градиентов
-            q_values = self.policy_net(state_tensor)
-            return torch.argmax(q_values).item() # Выбираем действие с максимальной ценностью
+        self._state_array[0] = state # Копирование в готовый входной тензор без новых выделений памяти
+        with torch.inference_mode(): # Без графа вычислений и учета версий тензоров
+            q_values = self.acting_net(self._state_buffer)
+            return int(q_values.argmax()) # Выбираем действие с максимальной ценностью
+
+    def choose_actions(self, states, training=True):
+        """
+        Выбор действий для пакета состояний (векторизованная среда)
+
+        :param states: массив формы (N, state_dim)
+        :return: массив действий формы (N,)
+        """
+        states = np.asarray(states, dtype=np.float32)
+        with torch.inference_mode():
+            actions = self.acting_net(torch.from_numpy(states)).argmax(1).numpy()
+        if training:
+            explore = np.random.random(len(states)) < self.epsilon # Игры со случайным действием
+            actions = np.where(explore, np.random.randint(0, self.action_dim, len(states)), actions)
+        return actions
 
     def store_experience(self, state, action, reward, next_state, done):
         """Сохранение опыта в память"""
-        self.memory.append((state, action, reward, next_state, done))
+        self.memory.add(state, action, reward, next_state, done)
 
     def train(self):
         """Обучение на мини-батче из памяти"""
@@ -57,15 +116,14 @@ class DQNAgent:
             return 0
 
         # Выбор случайного мини-батча
-        batch = random.sample(self.memory, self.batch_size)
-        states, actions, rewards, next_states, dones = zip(*batch)
+        if self.prioritized:
+            batch, indices, weights = self.memory.sample_prioritized(self.batch_size)
+        else:
+            batch = self.memory.sample(self.batch_size)
 
-        # Конвертация в тензоры
-        states = torch.FloatTensor(states)
-        actions = torch.LongTensor(actions).unsqueeze(1)
-        rewards = torch.FloatTensor(rewards)
-        next_states = torch.FloatTensor(next_states)
-        dones = torch.FloatTensor(dones)
+        # Конвертация в тензоры без копирования данных
+        states, actions, rewards, next_states, dones = map(torch.from_numpy, batch)
+        actions = actions.unsqueeze(1)
 
         # Текущие Q-значения
         current_q = self.policy_net(states).gather(1, actions).squeeze()
@@ -77,7 +135,13 @@ class DQNAgent:
             target_q = rewards + (1 - dones) * self.gamma * next_q # Формула Беллмана
 
         # Вычисление потерь
-        loss = self.loss_fn(current_q, target_q)
+        if self.prioritized:
+            td_errors = target_q - current_q
+            # Веса важности компенсируют смещение приоритетного выбора
+            loss = (torch.from_numpy(weights) * td_errors.pow(2)).mean()
+            self.memory.update_priorities(indices, td_errors.detach().abs().numpy())
+        else:
+            loss = self.loss_fn(current_q, target_q)
 
         # Оптимизация
         self.optimizer.zero_grad()
@@ -0,0 +1,79 @@
+"""
+Бенчмарк выбора действий DQNAgent на CPU.
+
+Замеряются:
+- задержка одного действия: прежний путь (torch.FloatTensor + unsqueeze
+  + no_grad) против choose_action в режимах eager, trace и script;
+- пропускная способность choose_actions для пакетов состояний
+  векторизованной среды разного размера.
+
+Запуск: python bench_acting.py [--calls 20000] [--threads 1]
+"""
+
+import argparse
+import time
+import numpy as np
+import torch
+from agent import DQNAgent, set_torch_threads
+from vec_env import VectorizedSnakeGame
+
+STATE_DIM = 12
+ACTION_DIM = 3
+
+
+def legacy_action(agent, state):
+    """Прежний выбор жадного действия"""
+    state_tensor = torch.FloatTensor(state).unsqueeze(0)
+    with torch.no_grad():
+        q_values = agent.policy_net(state_tensor)
+        return torch.argmax(q_values).item()
+
+
+def time_per_call(fn, calls):
+    for _ in range(100):  # прогрев (в том числе оптимизация графа TorchScript)
+        fn()
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк выбора действий")
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--threads", type=int, default=1)
+    args = parser.parse_args()
+
+    set_torch_threads(args.threads)
+    print(f"Потоков torch: {torch.get_num_threads()}")
+    torch.manual_seed(0)
+    agent = DQNAgent(STATE_DIM, ACTION_DIM)
+    state = VectorizedSnakeGame(1, seed=0).get_state()[0]
+
+    legacy = time_per_call(lambda: legacy_action(agent, state), args.calls)
+    print(f"Одно действие: прежний путь {legacy * 1e6:7.1f} мкс")
+    for mode in ("eager", "trace", "script"):
+        agent.optimize_acting(mode)
+        latency = time_per_call(
+            lambda: agent.choose_action(state, training=False), args.calls
+        )
+        print(
+            f"Одно действие: {mode:6s}       {latency * 1e6:7.1f} мкс "
+            f"(x{legacy / latency:.2f})"
+        )
+
+    agent.optimize_acting("trace")
+    for num_envs in (1, 16, 256, 1024):
+        states = VectorizedSnakeGame(num_envs, seed=0).get_state()
+        calls = max(args.calls // num_envs, 200)
+        per_batch = time_per_call(
+            lambda: agent.choose_actions(states, training=False), calls
+        )
+        print(
+            f"Пакет {num_envs:5d}: {per_batch * 1e6:8.1f} мкс на пакет, "
+            f"{num_envs / per_batch:12,.0f} действий/с"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Бенчмарк приоритетного буфера опыта: пропускная способность выбора батчей
+и пакетного обновления приоритетов при большой емкости.
+
+Запуск: python bench_prioritized.py [--capacity 1000000] [--batch-size 64] [--iterations 2000]
+"""
+
+import argparse
+import time
+import numpy as np
+from replay_buffer import ReplayBuffer, PrioritizedReplayBuffer
+
+STATE_DIM = 12
+
+
+def fill(buffer, chunk=65536, seed=0):
+    """Заполняет буфер синтетическими переходами до емкости"""
+    rng = np.random.default_rng(seed)
+    while len(buffer) < buffer.capacity:
+        count = min(chunk, buffer.capacity - len(buffer))
+        buffer.add_batch(
+            rng.random((count, STATE_DIM), dtype=np.float32),
+            rng.integers(0, 3, count),
+            rng.normal(size=count).astype(np.float32),
+            rng.random((count, STATE_DIM), dtype=np.float32),
+            np.zeros(count, dtype=np.float32),
+        )
+
+
+def measure(fn, iterations):
+    fn()  # прогрев
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк приоритетного буфера опыта")
+    parser.add_argument("--capacity", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    uniform = ReplayBuffer(args.capacity, STATE_DIM, seed=0)
+    prioritized = PrioritizedReplayBuffer(args.capacity, STATE_DIM, seed=0)
+    start = time.perf_counter()
+    fill(uniform)
+    fill(prioritized)
+    print(
+        f"Заполнение двух буферов по {args.capacity} переходов: "
+        f"{time.perf_counter() - start:.2f} с"
+    )
+
+    rng = np.random.default_rng(1)
+    td_errors = rng.exponential(size=args.batch_size)
+
+    def prioritized_step():
+        _, indices, _ = prioritized.sample_prioritized(args.batch_size)
+        prioritized.update_priorities(indices, td_errors)
+
+    results = {
+        "равномерный выбор": measure(
+            lambda: uniform.sample(args.batch_size), args.iterations
+        ),
+        "приоритетный выбор": measure(
+            lambda: prioritized.sample_prioritized(args.batch_size), args.iterations
+        ),
+        "выбор + обновление приоритетов": measure(prioritized_step, args.iterations),
+    }
+    for name, seconds in results.items():
+        print(
+            f"{name:32s} {seconds * 1e6:8.1f} мкс/батч  "
+            f"{args.batch_size / seconds:12.0f} переходов/с"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Бенчмарк буфера опыта: прежний deque кортежей против ReplayBuffer.
+
+Замеряются два времени на одно обновление:
+- подготовка батча (выбор переходов и построение тензоров);
+- полный шаг обучения: прежний DQNAgent.train (deque, random.sample, zip,
+  torch.FloatTensor от кортежа массивов) против нынешнего DQNAgent.train.
+
+Запуск: python bench_replay.py [--capacity 20000] [--batch-size 64] [--updates 2000]
+"""
+
+import argparse
+import random
+import time
+from collections import deque
+import numpy as np
+import torch
+from agent import DQNAgent
+from replay_buffer import ReplayBuffer
+
+STATE_DIM = 12
+ACTION_DIM = 3
+
+
+def random_transitions(count, seed=0):
+    """Синтетические переходы с размерностями состояния среды SnakeGame"""
+    rng = np.random.default_rng(seed)
+    states = rng.random((count, STATE_DIM), dtype=np.float32)
+    next_states = rng.random((count, STATE_DIM), dtype=np.float32)
+    actions = rng.integers(0, ACTION_DIM, count)
+    rewards = rng.normal(size=count).astype(np.float32)
+    dones = (rng.random(count) < 0.05).astype(np.float32)
+    return states, actions, rewards, next_states, dones
+
+
+def legacy_batch(memory, batch_size):
+    """Прежняя подготовка батча из deque кортежей"""
+    batch = random.sample(memory, batch_size)
+    states, actions, rewards, next_states, dones = zip(*batch)
+    return (
+        torch.FloatTensor(states),
+        torch.LongTensor(actions).unsqueeze(1),
+        torch.FloatTensor(rewards),
+        torch.FloatTensor(next_states),
+        torch.FloatTensor(dones),
+    )
+
+
+class LegacyDQNAgent(DQNAgent):
+    """DQNAgent с прежней памятью (deque кортежей) и прежним шагом обучения"""
+
+    def __init__(self, state_dim, action_dim, capacity):
+        super().__init__(state_dim, action_dim)
+        self.memory = deque(maxlen=capacity)
+
+    def store_experience(self, state, action, reward, next_state, done):
+        self.memory.append((state, action, reward, next_state, done))
+
+    def train(self):
+        if len(self.memory) < self.batch_size:
+            return 0
+
+        states, actions, rewards, next_states, dones = legacy_batch(
+            self.memory, self.batch_size
+        )
+
+        current_q = self.policy_net(states).gather(1, actions).squeeze()
+        with torch.no_grad():
+            next_actions = self.policy_net(next_states).argmax(1, keepdim=True)
+            next_q = self.target_net(next_states).gather(1, next_actions).squeeze()
+            target_q = rewards + (1 - dones) * self.gamma * next_q
+        loss = self.loss_fn(current_q, target_q)
+
+        self.optimizer.zero_grad()
+        loss.backward()
+        torch.nn.utils.clip_grad_norm_(self.policy_net.parameters(), 1.0)
+        self.optimizer.step()
+
+        if self.epsilon > self.epsilon_min:
+            self.epsilon *= self.epsilon_decay
+        self.train_step_counter += 1
+        if self.train_step_counter % self.target_update_freq == 0:
+            self.target_net.load_state_dict(self.policy_net.state_dict())
+        return loss.item()
+
+
+def buffer_batch(buffer, batch_size):
+    """Подготовка батча из ReplayBuffer"""
+    states, actions, rewards, next_states, dones = map(
+        torch.from_numpy, buffer.sample(batch_size)
+    )
+    return states, actions.unsqueeze(1), rewards, next_states, dones
+
+
+def time_per_call(fn, calls):
+    fn()  # прогрев
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк буфера опыта")
+    parser.add_argument("--capacity", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--updates", type=int, default=2000)
+    args = parser.parse_args()
+
+    torch.set_num_threads(1)
+    data = random_transitions(args.capacity)
+
+    torch.manual_seed(0)
+    legacy_agent = LegacyDQNAgent(STATE_DIM, ACTION_DIM, args.capacity)
+    agent = DQNAgent(STATE_DIM, ACTION_DIM)
+    agent.policy_net.load_state_dict(legacy_agent.policy_net.state_dict())
+    agent.target_net.load_state_dict(legacy_agent.target_net.state_dict())
+    agent.memory = ReplayBuffer(args.capacity, STATE_DIM, seed=0)
+    agent.memory.add_batch(*data)
+    # Переходы в прежнем виде: кортежи из массивов состояний и скаляров Python
+    for state, action, reward, next_state, done in zip(*data):
+        legacy_agent.store_experience(
+            state, int(action), float(reward), next_state, float(done)
+        )
+
+    legacy = time_per_call(
+        lambda: legacy_batch(legacy_agent.memory, args.batch_size), args.updates
+    )
+    ring = time_per_call(
+        lambda: buffer_batch(agent.memory, args.batch_size), args.updates
+    )
+    print(
+        f"Подготовка батча: deque {legacy * 1e6:8.1f} мкс, "
+        f"ReplayBuffer {ring * 1e6:8.1f} мкс (x{legacy / ring:.1f})"
+    )
+
+    # Полный шаг обучения обоих вариантов с одинаковыми начальными весами
+    old_update = time_per_call(legacy_agent.train, args.updates)
+    new_update = time_per_call(agent.train, args.updates)
+    print(
+        f"Шаг обучения:     deque {old_update * 1e6:8.1f} мкс, "
+        f"ReplayBuffer {new_update * 1e6:8.1f} мкс (x{old_update / new_update:.1f})"
+    )
+
+
+if __name__ == "__main__":
+    main()
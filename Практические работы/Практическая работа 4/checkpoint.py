@@ -0,0 +1,170 @@
+"""
+Контрольные точки обучения DQN.
+
+Контрольная точка — каталог episode_NNNNNN внутри каталога запуска:
+- networks.pt — веса policy- и target-сети, состояние оптимизатора,
+  состояние генератора torch;
+- state.pkl — epsilon, счетчики, статистика эпизодов, состояния генераторов
+  random, numpy, среды и буфера опыта;
+- replay/ — массивы буфера опыта в файлах .npy, которые при возобновлении
+  отображаются в память, а не читаются целиком.
+
+Каталог сначала пишется под временным именем и переименовывается
+одной операцией; затем так же атомарно обновляется файл latest с именем
+последней точки. Прерывание на любом этапе оставляет предыдущую точку целой.
+"""
+
+import os
+import pickle
+import random
+import shutil
+import numpy as np
+import torch
+
+LATEST_FILE = "latest"
+
+
+def _fsync(path):
+    with open(path, "rb") as f:
+        os.fsync(f.fileno())
+
+
+def _write_atomic(path, data):
+    """Запись файла через временный файл и переименование"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _checkpoint_names(directory):
+    """Имена завершенных контрольных точек каталога"""
+    return [
+        entry
+        for entry in os.listdir(directory)
+        if entry.startswith("episode_")
+        and not entry.endswith(".tmp")
+        and os.path.exists(os.path.join(directory, entry, "state.pkl"))
+    ]
+
+
+def clear_checkpoints(directory):
+    """Удаляет контрольные точки и указатель latest (перед новым запуском)"""
+    if not os.path.isdir(directory):
+        return
+    latest = os.path.join(directory, LATEST_FILE)
+    if os.path.exists(latest):
+        os.remove(latest)
+    for entry in os.listdir(directory):
+        if entry.startswith("episode_"):
+            shutil.rmtree(os.path.join(directory, entry), ignore_errors=True)
+
+
+def latest_checkpoint(directory):
+    """Путь к последней контрольной точке или None, если их нет"""
+    try:
+        with open(os.path.join(directory, LATEST_FILE), encoding="utf-8") as f:
+            name = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return os.path.join(directory, name)
+
+
+def save_checkpoint(directory, agent, env, progress, keep=2):
+    """
+    Сохраняет состояние обучения на границе эпизодов.
+
+    :param directory: каталог запуска
+    :param agent: DQNAgent
+    :param env: SnakeGame (сохраняется состояние генератора еды)
+    :param progress: {"episode": число завершенных эпизодов,
+                      "scores", "losses", "epsilons": статистика}
+    :param keep: сколько последних по времени записи точек хранить (не меньше 1)
+    :return: путь к контрольной точке
+    """
+    if keep < 1:
+        raise ValueError("Нужно хранить хотя бы одну контрольную точку")
+    os.makedirs(directory, exist_ok=True)
+    name = f"episode_{progress['episode']:06d}"
+    path = os.path.join(directory, name)
+    tmp_path = path + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)  # остаток прерванной записи
+    os.makedirs(tmp_path)
+
+    memory_state = agent.memory.save(os.path.join(tmp_path, "replay"))
+    networks_path = os.path.join(tmp_path, "networks.pt")
+    torch.save(
+        {
+            "policy_net": agent.policy_net.state_dict(),
+            "target_net": agent.target_net.state_dict(),
+            "optimizer": agent.optimizer.state_dict(),
+            "torch_rng": torch.get_rng_state(),
+        },
+        networks_path,
+    )
+    _fsync(networks_path)
+    state = {
+        "prioritized": agent.prioritized,
+        "epsilon": agent.epsilon,
+        "train_step_counter": agent.train_step_counter,
+        "memory": memory_state,
+        "python_rng": random.getstate(),
+        "numpy_rng": np.random.get_state(),
+        "env_rng": env.rng.getstate(),
+        "progress": progress,
+    }
+    _write_atomic(os.path.join(tmp_path, "state.pkl"), pickle.dumps(state))
+
+    if os.path.exists(path):
+        shutil.rmtree(path)
+    os.replace(tmp_path, path)
+    _write_atomic(os.path.join(directory, LATEST_FILE), name.encode("utf-8"))
+
+    # Старые точки выбираются по времени записи, а не по номеру эпизода:
+    # в каталоге могут остаться точки с большими номерами от прежних запусков.
+    # Только что записанная точка не удаляется никогда. Отображенные в память
+    # файлы в Windows удалить нельзя, такие каталоги удалятся при следующем сохранении
+    def written_at(entry):
+        return os.path.getmtime(os.path.join(directory, entry, "state.pkl"))
+
+    older = sorted(
+        (entry for entry in _checkpoint_names(directory) if entry != name),
+        key=written_at,
+    )
+    for entry in older[: max(len(older) - (keep - 1), 0)]:
+        shutil.rmtree(os.path.join(directory, entry), ignore_errors=True)
+    return path
+
+
+def load_checkpoint(directory, agent, env):
+    """
+    Восстанавливает последнюю контрольную точку каталога запуска.
+
+    Агент и среда должны быть созданы с теми же параметрами, что и при
+    сохранении. Восстанавливаются и все генераторы случайных чисел,
+    поэтому продолжение обучения совпадает с непрерывным запуском.
+    :return: progress, переданный в save_checkpoint, или None, если точек нет
+    """
+    path = latest_checkpoint(directory)
+    if path is None:
+        return None
+    with open(os.path.join(path, "state.pkl"), "rb") as f:
+        state = pickle.load(f)
+    if state["prioritized"] != agent.prioritized:
+        raise ValueError("Тип буфера опыта агента не совпадает с контрольной точкой")
+    networks = torch.load(os.path.join(path, "networks.pt"), map_location="cpu")
+
+    agent.policy_net.load_state_dict(networks["policy_net"])
+    agent.target_net.load_state_dict(networks["target_net"])
+    agent.optimizer.load_state_dict(networks["optimizer"])
+    agent.epsilon = state["epsilon"]
+    agent.train_step_counter = state["train_step_counter"]
+    agent.memory.load(os.path.join(path, "replay"), state["memory"])
+
+    torch.set_rng_state(networks["torch_rng"])
+    random.setstate(state["python_rng"])
+    np.random.set_state(state["numpy_rng"])
+    env.rng.setstate(state["env_rng"])
+    return state["progress"]
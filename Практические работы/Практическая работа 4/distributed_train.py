@@ -0,0 +1,238 @@
+"""
+Обучение в схеме «несколько акторов — один ученик».
+
+Процессы-акторы играют в собственные копии SnakeGame без графики, выбирают
+действия локальной копией QNetwork со своим epsilon и пишут переходы
+в общий буфер опыта в разделяемой памяти (SharedReplayBuffer).
+Ученик (основной процесс) непрерывно выполняет DQNAgent.train на этом буфере
+и каждые sync_interval обновлений публикует веса policy-сети; акторы
+подгружают опубликованные веса раз в sync_interval своих шагов.
+
+Запуск: python distributed_train.py [--actors 4] [--updates 20000] [--sync-interval 100]
+"""
+
+import argparse
+import multiprocessing as mp
+import queue
+import numpy as np
+import torch
+from torch.nn.utils import parameters_to_vector, vector_to_parameters
+from env import SnakeGame
+from agent import DQNAgent
+from model import QNetwork
+from replay_buffer import ReplayBuffer, SharedReplayBuffer
+
+STATE_DIM = 12
+ACTION_DIM = 3
+
+
+class SharedWeights:
+    """Веса сети в разделяемой памяти с номером версии"""
+
+    def __init__(self, num_params):
+        self.vector = mp.Array("f", num_params)  # со встроенной блокировкой
+        self.version = mp.Value("l", 0)
+
+    def publish(self, model):
+        """Записывает веса модели и увеличивает версию"""
+        flat = parameters_to_vector(model.parameters()).detach().numpy()
+        with self.vector.get_lock():
+            np.frombuffer(self.vector.get_obj(), dtype=np.float32)[:] = flat
+            self.version.value += 1
+
+    def load_into(self, model, known_version):
+        """Подгружает веса, если опубликована более новая версия; возвращает версию"""
+        if self.version.value == known_version:
+            return known_version
+        with self.vector.get_lock():
+            flat = np.frombuffer(self.vector.get_obj(), dtype=np.float32).copy()
+            version = self.version.value
+        vector_to_parameters(torch.from_numpy(flat), model.parameters())
+        return version
+
+
+def actor_epsilons(num_actors, base=0.4, alpha=7.0):
+    """Epsilon акторов по схеме Ape-X: от base у первого до base^(1+alpha) у последнего"""
+    if num_actors == 1:
+        return [base]
+    return [base ** (1 + alpha * i / (num_actors - 1)) for i in range(num_actors)]
+
+
+def actor_process(
+    actor_id,
+    buffer_handle,
+    weights,
+    epsilon,
+    sync_interval,
+    flush_every,
+    stop_event,
+    scores_queue,
+    seed,
+):
+    """Цикл актора: игра, выбор действий, запись переходов в общий буфер"""
+    torch.set_num_threads(1)
+    rng = np.random.default_rng(seed)
+    buffer = SharedReplayBuffer.attach(buffer_handle, seed=seed)
+    env = SnakeGame(render_mode=None, seed=seed)
+    net = QNetwork(STATE_DIM, ACTION_DIM)
+    version = weights.load_into(net, -1)
+
+    pending = []  # локальная пачка переходов: запись в буфер одной операцией
+    state = env.reset()
+    steps = 0
+    try:
+        while not stop_event.is_set():
+            if rng.random() < epsilon:
+                action = int(rng.integers(ACTION_DIM))
+            else:
+                with torch.inference_mode():
+                    q_values = net(torch.from_numpy(state).unsqueeze(0))
+                action = int(q_values.argmax())
+
+            next_state, reward, done, info = env.step(action)
+            pending.append((state, action, reward, next_state, done))
+            state = next_state
+            steps += 1
+
+            if done:
+                scores_queue.put((actor_id, info["score"]))
+                state = env.reset()
+            if len(pending) >= flush_every:
+                buffer.add_batch(*map(np.array, zip(*pending)))
+                pending = []
+            if steps % sync_interval == 0:
+                version = weights.load_into(net, version)
+    finally:
+        buffer.close()
+
+
+def _drain(scores_queue, scores):
+    """Переносит накопленные счета эпизодов из очереди в список"""
+    while True:
+        try:
+            scores.append(scores_queue.get_nowait())
+        except queue.Empty:
+            return
+
+
+def train_distributed(
+    num_actors=4,
+    updates=20000,
+    epsilons=None,
+    sync_interval=100,
+    capacity=100000,
+    flush_every=64,
+    seed=0,
+    log_every=1000,
+):
+    """
+    Обучение с параллельными акторами.
+
+    :param num_actors: число процессов-акторов
+    :param updates: число шагов обучения ученика
+    :param epsilons: epsilon каждого актора (по умолчанию actor_epsilons)
+    :param sync_interval: период публикации весов (в обновлениях ученика)
+                          и их подгрузки (в шагах актора)
+    :param capacity: емкость общего буфера опыта
+    :param flush_every: число переходов, записываемых актором за раз
+    :param seed: зерно; актор i использует seed + i + 1
+    :return: обученный агент и список (номер актора, счет) завершенных эпизодов
+    """
+    epsilons = epsilons or actor_epsilons(num_actors)
+    if len(epsilons) != num_actors:
+        raise ValueError("Число значений epsilon должно совпадать с числом акторов")
+    torch.manual_seed(seed)
+
+    agent = DQNAgent(STATE_DIM, ACTION_DIM)
+    buffer = SharedReplayBuffer(capacity, STATE_DIM, mp.Lock(), seed=seed)
+    agent.memory = buffer
+    weights = SharedWeights(sum(p.numel() for p in agent.policy_net.parameters()))
+    weights.publish(agent.policy_net)
+
+    stop_event = mp.Event()
+    scores_queue = mp.Queue()
+    actors = [
+        mp.Process(
+            target=actor_process,
+            args=(
+                i,
+                buffer.handle(),
+                weights,
+                epsilons[i],
+                sync_interval,
+                flush_every,
+                stop_event,
+                scores_queue,
+                seed + i + 1,
+            ),
+            daemon=True,
+        )
+        for i in range(num_actors)
+    ]
+    for actor in actors:
+        actor.start()
+
+    scores = []
+    done_updates = 0
+    try:
+        while done_updates < updates:
+            if len(buffer) < agent.batch_size:
+                stop_event.wait(0.01)  # ждем первых переходов от акторов
+                continue
+            agent.train()
+            done_updates += 1
+            if done_updates % sync_interval == 0:
+                weights.publish(agent.policy_net)
+            _drain(scores_queue, scores)
+            if log_every and done_updates % log_every == 0:
+                recent = [score for _, score in scores[-100:]]
+                print(
+                    f"Обновлений: {done_updates:6d}/{updates} | "
+                    f"Эпизодов: {len(scores):6d} | "
+                    f"Средний счет (100 эп.): {np.mean(recent) if recent else 0:5.2f} | "
+                    f"Память: {len(buffer)}"
+                )
+    finally:
+        stop_event.set()
+        for actor in actors:
+            # Недочитанная очередь не дает процессу-актору завершиться
+            _drain(scores_queue, scores)
+            actor.join(timeout=5)
+            if actor.is_alive():
+                actor.terminate()
+        # Буфер нужен агенту только во время обучения: переносим опыт в локальный
+        agent.memory = ReplayBuffer(capacity, STATE_DIM, seed=seed)
+        agent.memory.add_batch(*buffer.get(np.arange(len(buffer))))
+        buffer.close(unlink=True)
+    return agent, scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Обучение с параллельными акторами")
+    parser.add_argument("--actors", type=int, default=4)
+    parser.add_argument("--updates", type=int, default=20000)
+    parser.add_argument("--sync-interval", type=int, default=100)
+    parser.add_argument("--capacity", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--epsilons",
+        type=float,
+        nargs="+",
+        help="epsilon каждого актора (по умолчанию по схеме Ape-X)",
+    )
+    args = parser.parse_args()
+
+    agent, scores = train_distributed(
+        num_actors=args.actors,
+        updates=args.updates,
+        epsilons=args.epsilons,
+        sync_interval=args.sync_interval,
+        capacity=args.capacity,
+        seed=args.seed,
+    )
+    torch.save(agent.policy_net.state_dict(), "policy_net.pt")
+    print(f"Эпизодов: {len(scores)}, веса сохранены в policy_net.pt")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 import random
 import numpy as np
-import pygame
+from collections import deque
 
 
 GRID_WIDTH = 10
@@ -15,13 +15,51 @@ LEFT = (-1, 0)
 RIGHT = (1, 0)
 
 
+class FreeCells:
+    """
+    Множество свободных клеток с доступом по индексу.
+
+    Удаление переставляет последний элемент на место удаляемого,
+    поэтому добавление, удаление и выбор случайной клетки выполняются за O(1).
+    """
+
+    def __init__(self, cells):
+        self.cells = list(cells)
+        self.position = {cell: i for i, cell in enumerate(self.cells)}
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return cell in self.position
+
+    def add(self, cell):
+        self.position[cell] = len(self.cells)
+        self.cells.append(cell)
+
+    def remove(self, cell):
+        i = self.position.pop(cell)
+        last = self.cells.pop()
+        if last != cell:
+            self.cells[i] = last
+            self.position[last] = i
+
+    def choice(self, rng):
+        return self.cells[rng.randrange(len(self.cells))]
+
+
 class SnakeGame:
-    def __init__(self, render_mode=None):
+    def __init__(self, render_mode=None, width=GRID_WIDTH, height=GRID_HEIGHT, seed=None):
+        self.width = width # Ширина поля в клетках
+        self.height = height # Высота поля в клетках
+        self.rng = random.Random(seed) # Собственный генератор: размещение еды воспроизводимо при заданном seed
         self.render_mode = render_mode # Режим отрисовки (None для обучения без графики и "human" для визуализации)
         if render_mode == "human":
+            import pygame  # Только для визуализации: обучение без графики обходится без pygame
+
             pygame.init()
             self.screen = pygame.display.set_mode(
-                (GRID_WIDTH * BLOCK_SIZE, GRID_HEIGHT * BLOCK_SIZE)
+                (self.width * BLOCK_SIZE, self.height * BLOCK_SIZE)
             )
             self.clock = pygame.time.Clock() # Объект для контроля FPS
             self.font = pygame.font.Font(None, 36) # Шрифт для отображения счёта
@@ -29,7 +67,12 @@ class SnakeGame:
         self.reset() # Инициализация начального состояния среды
 
     def reset(self):
-        self.snake = [(GRID_WIDTH // 2, GRID_HEIGHT // 2)] # Змейка представлена списком координат сегментов, первый элемент — голова
+        self.snake = deque([(self.width // 2, self.height // 2)]) # Змейка представлена очередью координат сегментов, первый элемент — голова
+        self.occupied = set(self.snake) # Клетки, занятые змейкой: проверка столкновения за O(1)
+        self.free = FreeCells( # Свободные клетки для размещения еды
+            (x, y) for y in range(self.height) for x in range(self.width)
+        )
+        self.free.remove(self.snake[0])
         self.direction = RIGHT # Начальное направление движения
         self.food = self._generate_food() # Создание еды в случайной позиции
         self.score = 0
@@ -38,13 +81,8 @@ class SnakeGame:
         return self.get_state()
 
     def _generate_food(self):
-        while True: # Генерируем до тех пор, пока еда не окажется не на змейке.
-            food = (
-                random.randint(0, GRID_WIDTH - 1),
-                random.randint(0, GRID_HEIGHT - 1),
-            )
-            if food not in self.snake:
-                return food
+        # Случайная свободная клетка: один выбор независимо от длины змейки
+        return self.free.choice(self.rng)
 
     def _danger_ahead(self):
         '''
@@ -59,9 +97,9 @@ class SnakeGame:
         nx = head_x + self.direction[0] # Координаты следующей клетки
         ny = head_y + self.direction[1] # Координаты следующей клетки
 
-        if nx < 0 or nx >= GRID_WIDTH or ny < 0 or ny >= GRID_HEIGHT: # Столкновение со стеной
+        if nx < 0 or nx >= self.width or ny < 0 or ny >= self.height: # Столкновение со стеной
             return 1.0
-        if (nx, ny) in self.snake: # Столкновение с телом
+        if (nx, ny) in self.occupied: # Столкновение с телом
             return 1.0
         return 0.0 # Безопасное движение
 
@@ -72,13 +110,13 @@ class SnakeGame:
 
         # Базовые признаки
         state = [
-            head_x / GRID_WIDTH,  # Нормализованная позиция X головы
-            head_y / GRID_HEIGHT,  # Нормализованная позиция Y головы
-            food_x / GRID_WIDTH,  # Нормализованная позиция X еды
-            food_y / GRID_HEIGHT,  # Нормализованная позиция Y еды
+            head_x / self.width,  # Нормализованная позиция X головы
+            head_y / self.height,  # Нормализованная позиция Y головы
+            food_x / self.width,  # Нормализованная позиция X еды
+            food_y / self.height,  # Нормализованная позиция Y еды
             # Расстояние до еды
-            abs(head_x - food_x) / GRID_WIDTH,
-            abs(head_y - food_y) / GRID_HEIGHT,
+            abs(head_x - food_x) / self.width,
+            abs(head_y - food_y) / self.height,
             # Направление движения (one-hot encoding)
             1 if self.direction == UP else 0,
             1 if self.direction == DOWN else 0,
@@ -87,7 +125,7 @@ class SnakeGame:
             # Опасность впереди
             self._danger_ahead(),
             # Длина змейки (нормализованная)
-            len(self.snake) / (GRID_WIDTH * GRID_HEIGHT),
+            len(self.snake) / (self.width * self.height),
         ]
         return np.array(state, dtype=np.float32)
 
@@ -124,33 +162,40 @@ class SnakeGame:
         # Проверка столкновений
         if (
             new_head[0] < 0
-            or new_head[0] >= GRID_WIDTH
+            or new_head[0] >= self.width
             or new_head[1] < 0
-            or new_head[1] >= GRID_HEIGHT
+            or new_head[1] >= self.height
         ):
             self.done = True
             return self.get_state(), -10.0, self.done, {"score": self.score}
 
-        if new_head in self.snake:
+        if new_head in self.occupied:  # Хвост еще не удален: в него тоже нельзя войти
             self.done = True
             return self.get_state(), -10.0, self.done, {"score": self.score}
 
         # Добавление новой головы
-        self.snake.insert(0, new_head)
+        self.snake.appendleft(new_head)
+        self.occupied.add(new_head)
+        self.free.remove(new_head)
 
         # Проверка съедания еды
         reward = -0.01  # Маленький штраф за каждый шаг
         if new_head == self.food:
             self.score += 1
-            self.food = self._generate_food()
+            if len(self.free):
+                self.food = self._generate_food()
+            else:
+                self.done = True  # Змейка заняла все поле: еду разместить негде
             reward = 10.0  # Большая награда за еду
             self.steps_without_food = 0
         else:
             # Удаляем хвост только если не съели еду
-            self.snake.pop()
+            tail = self.snake.pop()
+            self.occupied.discard(tail)
+            self.free.add(tail)
 
         # Штраф за слишком долгое блуждание без еды
-        if self.steps_without_food > GRID_WIDTH * GRID_HEIGHT * 2:
+        if self.steps_without_food > self.width * self.height * 2:
             reward = -5.0
             self.done = True
 
@@ -170,11 +215,13 @@ class SnakeGame:
         if self.render_mode != "human":
             return
 
+        import pygame
+
         self.screen.fill((0, 0, 0))
 
         # Рисуем сетку
-        for x in range(GRID_WIDTH):
-            for y in range(GRID_HEIGHT):
+        for x in range(self.width):
+            for y in range(self.height):
                 rect = pygame.Rect(
                     x * BLOCK_SIZE, y * BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE
                 )
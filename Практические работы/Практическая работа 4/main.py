@@ -1,3 +1,4 @@
+import sys
 from train import train_agent
 from utils import plot_results, test_agent
 
@@ -5,21 +6,39 @@ from utils import plot_results, test_agent
 def main():
     EPISODES = 500
     RENDER_EVERY = 25
+    # python main.py --headless — обучение на сервере без графики
+    HEADLESS = "--headless" in sys.argv[1:]
+    # python main.py --resume — продолжение с последней контрольной точки
+    RESUME = "--resume" in sys.argv[1:]
+    CHECKPOINT_DIR = "checkpoints"
+    CHECKPOINT_EVERY = 25
 
     try:
         agent, scores, losses, epsilons = train_agent(
-            episodes=EPISODES, render_every=RENDER_EVERY
+            episodes=EPISODES,
+            render_every=RENDER_EVERY,
+            headless=HEADLESS,
+            checkpoint_dir=CHECKPOINT_DIR,
+            checkpoint_every=CHECKPOINT_EVERY,
+            resume=RESUME,
         )
-        plot_results(scores, losses, epsilons)
-        test_scores = test_agent(agent, episodes=5)
+        if HEADLESS:
+            plot_results(scores, losses, epsilons, save_path="training_results.png")
+        else:
+            plot_results(scores, losses, epsilons)
+            test_scores = test_agent(agent, episodes=5)
     except KeyboardInterrupt:
         print("Обучение прервано пользователем")
+        print(
+            f"Продолжить с последней контрольной точки ({CHECKPOINT_DIR}): "
+            "python main.py --resume"
+        )
     except Exception as e:
         print(f"Ошибка: {e}")
     finally:
-        import pygame
-
-        pygame.quit()
+        # pygame загружен, только если была визуализация
+        if "pygame" in sys.modules:
+            sys.modules["pygame"].quit()
 
 
 if __name__ == "__main__":
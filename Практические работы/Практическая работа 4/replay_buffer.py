@@ -0,0 +1,360 @@
+import os
+import numpy as np
+from multiprocessing import shared_memory
+
+
+class ReplayBuffer:
+    """
+    Буфер опыта фиксированной емкости на непрерывных массивах NumPy.
+
+    Переходы записываются по кольцу (самые старые перезаписываются),
+    мини-батч выбирается векторной индексацией. Массивы батча непрерывны
+    и имеют нужные типы, поэтому тензоры строятся из них без копирования
+    (torch.from_numpy).
+    """
+
+    def __init__(self, capacity, state_dim, seed=None):
+        """
+        :param capacity: максимальное число хранимых переходов
+        :param state_dim: размер вектора состояния
+        :param seed: зерно генератора выбора батчей
+        """
+        self.capacity = capacity
+        self.states = np.zeros((capacity, state_dim), dtype=np.float32)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_states = np.zeros((capacity, state_dim), dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=np.float32)
+        self.position = 0  # Индекс следующей записи
+        self.size = 0  # Число заполненных ячеек
+        self.rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return self.size
+
+    def add(self, state, action, reward, next_state, done):
+        """Добавление одного перехода"""
+        i = self.position
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        return i
+
+    def add_batch(self, states, actions, rewards, next_states, dones):
+        """Добавление пакета переходов (например, шага векторизованной среды)"""
+        count = len(actions)
+        indices = (self.position + np.arange(count)) % self.capacity
+        self.states[indices] = states
+        self.actions[indices] = actions
+        self.rewards[indices] = rewards
+        self.next_states[indices] = next_states
+        self.dones[indices] = dones
+        self.position = (self.position + count) % self.capacity
+        self.size = min(self.size + count, self.capacity)
+        return indices
+
+    def sample_indices(self, batch_size):
+        """Случайные индексы заполненных ячеек (с возвращением)"""
+        return self.rng.integers(0, self.size, batch_size)
+
+    def get(self, indices):
+        """Переходы с индексами indices: (states, actions, rewards, next_states, dones)"""
+        return (
+            self.states[indices],
+            self.actions[indices],
+            self.rewards[indices],
+            self.next_states[indices],
+            self.dones[indices],
+        )
+
+    def sample(self, batch_size):
+        """Случайный мини-батч переходов"""
+        return self.get(self.sample_indices(batch_size))
+
+    def _checkpoint_arrays(self):
+        """Массивы контрольной точки: {имя: (массив, число заполненных строк)}"""
+        names = ("states", "actions", "rewards", "next_states", "dones")
+        return {name: (getattr(self, name), self.size) for name in names}
+
+    def _restore_array(self, name, array):
+        setattr(self, name, array)
+
+    def save(self, directory):
+        """
+        Записывает массивы в файлы .npy каталога directory.
+
+        Файлы создаются как отображаемые в память (open_memmap); копируются
+        только заполненные строки, остальное место файла остается нулевым.
+        :return: счетчики и состояние генератора для load
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name, (array, rows) in self._checkpoint_arrays().items():
+            mapped = np.lib.format.open_memmap(
+                os.path.join(directory, name + ".npy"),
+                mode="w+",
+                dtype=array.dtype,
+                shape=array.shape,
+            )
+            mapped[:rows] = array[:rows]
+            mapped.flush()
+            del mapped
+        return {
+            "position": self.position,
+            "size": self.size,
+            "rng": self.rng.bit_generator.state,
+        }
+
+    def load(self, directory, state):
+        """
+        Подключает массивы, записанные save, без чтения в память.
+
+        Файлы отображаются в режиме копирования при записи: новые переходы
+        попадают в память процесса, а сохраненная контрольная точка не меняется.
+        """
+        for name, (array, _) in self._checkpoint_arrays().items():
+            mapped = np.load(os.path.join(directory, name + ".npy"), mmap_mode="c")
+            if mapped.shape != array.shape or mapped.dtype != array.dtype:
+                raise ValueError(f"Массив {name} не соответствует буферу")
+            self._restore_array(name, mapped)
+        self.position = state["position"]
+        self.size = state["size"]
+        self.rng.bit_generator.state = state["rng"]
+
+
+class SumTree:
+    """
+    Дерево сумм на массиве: листья — приоритеты, внутренние узлы — суммы потомков.
+
+    Узел i имеет потомков 2i и 2i + 1, корень — узел 1, листья занимают
+    индексы [size, 2 * size), где size — емкость, округленная до степени двойки.
+    Обновление и поиск по префиксной сумме выполняются за O(log n)
+    и векторизованы по пакету индексов.
+    """
+
+    def __init__(self, capacity):
+        self.size = 1
+        while self.size < capacity:
+            self.size *= 2
+        self.depth = self.size.bit_length() - 1
+        self.tree = np.zeros(2 * self.size, dtype=np.float64)
+
+    @property
+    def total(self):
+        return self.tree[1]
+
+    def update(self, indices, priorities):
+        """Записывает приоритеты листьев indices и пересчитывает суммы предков"""
+        nodes = np.asarray(indices) + self.size
+        self.tree[nodes] = priorities
+        for _ in range(self.depth):
+            # Повторяющиеся узлы получают одну и ту же сумму, поэтому unique не нужен
+            nodes = nodes // 2
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def get(self, indices):
+        """Приоритеты листьев indices"""
+        return self.tree[np.asarray(indices) + self.size]
+
+    def find(self, values):
+        """Индексы листьев, в интервалы префиксных сумм которых попадают values"""
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        for _ in range(self.depth):
+            left = 2 * nodes
+            go_right = values > self.tree[left]
+            values -= np.where(go_right, self.tree[left], 0.0)
+            nodes = left + go_right
+        return nodes - self.size
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """
+    Буфер опыта с приоритетным выбором (Prioritized Experience Replay).
+
+    Переход i выбирается с вероятностью p_i^alpha / sum(p^alpha), где p_i —
+    модуль последней TD-ошибки. Новые переходы получают наибольший приоритет,
+    чтобы быть выбранными хотя бы раз. Смещение компенсируется весами
+    важности (N * P(i))^-beta, нормированными на максимум в батче;
+    beta линейно растет до 1.
+    """
+
+    def __init__(
+        self,
+        capacity,
+        state_dim,
+        alpha=0.6,
+        beta=0.4,
+        beta_increment=1e-4,
+        epsilon=1e-6,
+        seed=None,
+    ):
+        """
+        :param alpha: степень приоритизации (0 — равномерный выбор)
+        :param beta: начальная степень компенсации смещения
+        :param beta_increment: прирост beta за один выбор батча
+        :param epsilon: добавка к |TD-ошибке|, чтобы приоритет не был нулевым
+        """
+        super().__init__(capacity, state_dim, seed)
+        self.tree = SumTree(capacity)
+        self.alpha = alpha
+        self.beta = beta
+        self.beta_increment = beta_increment
+        self.epsilon = epsilon
+        self.max_priority = 1.0
+
+    def add(self, state, action, reward, next_state, done):
+        i = super().add(state, action, reward, next_state, done)
+        self.tree.update([i], self.max_priority**self.alpha)
+        return i
+
+    def add_batch(self, states, actions, rewards, next_states, dones):
+        indices = super().add_batch(states, actions, rewards, next_states, dones)
+        self.tree.update(indices, self.max_priority**self.alpha)
+        return indices
+
+    def sample_indices(self, batch_size):
+        """Стратифицированный выбор: по одному индексу из равных долей суммы"""
+        total = self.tree.total
+        bounds = (np.arange(batch_size) + self.rng.random(batch_size)) / batch_size
+        indices = self.tree.find(bounds * total)
+        # Защита от погрешностей округления на границе заполненной части
+        return np.minimum(indices, self.size - 1)
+
+    def sample_prioritized(self, batch_size):
+        """
+        Мини-батч с весами важности.
+
+        :return: (переходы как в sample, индексы, веса float32)
+        """
+        indices = self.sample_indices(batch_size)
+        probabilities = self.tree.get(indices) / self.tree.total
+        weights = (self.size * probabilities) ** -self.beta
+        weights /= weights.max()
+        self.beta = min(1.0, self.beta + self.beta_increment)
+        return self.get(indices), indices, weights.astype(np.float32)
+
+    def update_priorities(self, indices, td_errors):
+        """Обновляет приоритеты выбранных переходов по их TD-ошибкам"""
+        priorities = np.abs(td_errors) + self.epsilon
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self.tree.update(indices, priorities**self.alpha)
+
+    def _checkpoint_arrays(self):
+        arrays = super()._checkpoint_arrays()
+        # Суммы внутренних узлов зависят от всех листьев, поэтому дерево пишется целиком
+        arrays["priorities"] = (self.tree.tree, len(self.tree.tree))
+        return arrays
+
+    def _restore_array(self, name, array):
+        if name == "priorities":
+            self.tree.tree = array
+        else:
+            super()._restore_array(name, array)
+
+    def save(self, directory):
+        state = super().save(directory)
+        state.update(beta=self.beta, max_priority=self.max_priority)
+        return state
+
+    def load(self, directory, state):
+        super().load(directory, state)
+        self.beta = state["beta"]
+        self.max_priority = state["max_priority"]
+
+
+class SharedReplayBuffer(ReplayBuffer):
+    """
+    Буфер опыта в разделяемой памяти для нескольких процессов.
+
+    Массивы переходов и счетчики (позиция записи, заполненность) размещены
+    в сегментах multiprocessing.shared_memory. Процесс-создатель передает
+    handle() другим процессам, и они подключаются через attach().
+    Запись и чтение выполняются под общей блокировкой: акторы не занимают
+    одни и те же ячейки, а выбранные строки копируются целиком, без смеси
+    старого и нового перехода после перезаписи кольца.
+    """
+
+    def __init__(self, capacity, state_dim, lock, names=None, seed=None):
+        """
+        :param lock: multiprocessing.Lock, общий для всех процессов
+        :param names: имена сегментов (None — создать новые)
+        """
+        self.capacity = capacity
+        self.state_dim = state_dim
+        self.lock = lock
+        self.rng = np.random.default_rng(seed)
+        self._segments = {}
+        create = names is None
+        layout = {
+            "states": ((capacity, state_dim), np.float32),
+            "actions": ((capacity,), np.int64),
+            "rewards": ((capacity,), np.float32),
+            "next_states": ((capacity, state_dim), np.float32),
+            "dones": ((capacity,), np.float32),
+            "counters": ((2,), np.int64),  # позиция записи, число заполненных ячеек
+        }
+        for field, (shape, dtype) in layout.items():
+            nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+            segment = shared_memory.SharedMemory(
+                name=None if create else names[field], create=create, size=nbytes
+            )
+            self._segments[field] = segment
+            array = np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+            if create:
+                array[:] = 0
+            setattr(self, field, array)
+
+    @property
+    def position(self):
+        return int(self.counters[0])
+
+    @position.setter
+    def position(self, value):
+        self.counters[0] = value
+
+    @property
+    def size(self):
+        return int(self.counters[1])
+
+    @size.setter
+    def size(self, value):
+        self.counters[1] = value
+
+    def handle(self):
+        """Описание буфера для подключения из другого процесса"""
+        names = {field: segment.name for field, segment in self._segments.items()}
+        return self.capacity, self.state_dim, self.lock, names
+
+    @classmethod
+    def attach(cls, handle, seed=None):
+        """Подключение к буферу, созданному в другом процессе"""
+        capacity, state_dim, lock, names = handle
+        return cls(capacity, state_dim, lock, names, seed)
+
+    def add(self, state, action, reward, next_state, done):
+        with self.lock:
+            return super().add(state, action, reward, next_state, done)
+
+    def add_batch(self, states, actions, rewards, next_states, dones):
+        with self.lock:
+            return super().add_batch(states, actions, rewards, next_states, dones)
+
+    def get(self, indices):
+        # sample выбирает индексы без блокировки: size только растет,
+        # поэтому индексы остаются корректными, а строки копируются под блокировкой
+        with self.lock:
+            return super().get(indices)
+
+    def close(self, unlink=False):
+        """Отключение от сегментов; unlink=True — удалить их (в процессе-создателе)"""
+        for field in list(self._segments):
+            setattr(self, field, None)
+        for segment in self._segments.values():
+            segment.close()
+            if unlink:
+                segment.unlink()
+        self._segments = {}
@@ -1,12 +1,35 @@
 import numpy as np
-import pygame
 from env import SnakeGame
-from agent import DQNAgent
-
-
-def train_agent(episodes=1000, render_every=50):
-    """Функция обучения с визуализацией"""
-    env = SnakeGame(render_mode="human")
+from agent import DQNAgent, set_torch_threads
+from checkpoint import clear_checkpoints, load_checkpoint, save_checkpoint
+
+
+def train_agent(
+    episodes=1000,
+    render_every=50,
+    headless=False,
+    checkpoint_dir=None,
+    checkpoint_every=25,
+    resume=False,
+):
+    """
+    Функция обучения с визуализацией
+
+    :param episodes: число эпизодов
+    :param render_every: отрисовывать каждый render_every-й эпизод
+    :param headless: обучение без графики: окно не создается, pygame не импортируется
+    :param checkpoint_dir: каталог контрольных точек (None — не сохранять)
+    :param checkpoint_every: сохранять контрольную точку каждые checkpoint_every эпизодов
+    :param resume: продолжить с последней контрольной точки checkpoint_dir;
+                   без resume прежние точки checkpoint_dir удаляются
+    """
+    set_torch_threads(1)  # Сеть маленькая: один поток быстрее
+    if headless:
+        env = SnakeGame(render_mode=None)
+    else:
+        import pygame
+
+        env = SnakeGame(render_mode="human")
     state_dim = len(env.get_state())
     action_dim = 3  # Вперед, направо, налево
     agent = DQNAgent(state_dim, action_dim)
@@ -14,13 +37,26 @@ def train_agent(episodes=1000, render_every=50):
     scores = []  # итоговый счёт за эпизод
     losses = []  # средняя функция потерь
     epsilons = []  # значение ε
+    start_episode = 0
+
+    if checkpoint_dir and not resume:
+        # Новый запуск: точки прежнего запуска перепутались бы с новыми
+        clear_checkpoints(checkpoint_dir)
+    if resume and checkpoint_dir:
+        progress = load_checkpoint(checkpoint_dir, agent, env)
+        if progress is not None:
+            start_episode = progress["episode"]
+            scores = progress["scores"]
+            losses = progress["losses"]
+            epsilons = progress["epsilons"]
+            print(f"Продолжение с эпизода {start_episode + 1}")
 
     print("Начало обучения...")
     print(f"Размер состояния: {state_dim}")
     print(f"Количество действий: {action_dim}")
 
     for episode in range(
-        episodes
+        start_episode, episodes
     ):  # Эпизод — один полный запуск игры от reset до done=True
         state = env.reset()  # Сброс среды
         total_reward = 0  # суммарная награда
@@ -28,10 +64,11 @@ def train_agent(episodes=1000, render_every=50):
         steps = 0  # число шагов в эпизоде
 
         # Обработка событий Pygame
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                return
+        if not headless:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    return
 
         while True:
             # Выбор действия
@@ -55,7 +92,8 @@ def train_agent(episodes=1000, render_every=50):
             steps += 1
 
             # Визуализация
-            if episode % render_every == 0:  # Рендеринг только некоторых эпизодов:
+            # Рендеринг только некоторых эпизодов
+            if not headless and episode % render_every == 0:
                 env.render()
                 pygame.display.set_caption(
                     f"Змейка DQN - Эпизод: {episode}, "
@@ -82,4 +120,18 @@ def train_agent(episodes=1000, render_every=50):
                 f"Память: {len(agent.memory)}"
             )
 
+        # Контрольная точка на границе эпизодов
+        if checkpoint_dir and (episode + 1) % checkpoint_every == 0:
+            save_checkpoint(
+                checkpoint_dir,
+                agent,
+                env,
+                {
+                    "episode": episode + 1,
+                    "scores": scores,
+                    "losses": losses,
+                    "epsilons": epsilons,
+                },
+            )
+
     return agent, scores, losses, epsilons
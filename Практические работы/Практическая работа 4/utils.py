@@ -1,11 +1,15 @@
-import matplotlib.pyplot as plt
 import numpy as np
-import pygame
 from env import SnakeGame
 
 
-def plot_results(scores, losses, epsilons):
-    """Визуализация результатов обучения"""
+def plot_results(scores, losses, epsilons, save_path=None):
+    """
+    Визуализация результатов обучения
+
+    :param save_path: сохранить графики в файл вместо показа в окне
+    """
+    import matplotlib.pyplot as plt
+
     fig, axes = plt.subplots(3, 1, figsize=(10, 12))
 
     # График счетов
@@ -51,11 +55,17 @@ def plot_results(scores, losses, epsilons):
     axes[2].grid(True, alpha=0.3)
 
     plt.tight_layout()
-    plt.show()
+    if save_path:
+        fig.savefig(save_path)
+        plt.close(fig)
+    else:
+        plt.show()
 
 
 def test_agent(agent, episodes=10):
     """Тестирование обученного агента"""
+    import pygame
+
     env = SnakeGame(render_mode="human")
     test_scores = []
 
@@ -0,0 +1,207 @@
+import numpy as np
+from env import GRID_WIDTH, GRID_HEIGHT, UP, DOWN, LEFT, RIGHT
+
+# Направления по часовой стрелке: поворот направо — следующий индекс, налево — предыдущий
+CLOCKWISE = np.array([UP, RIGHT, DOWN, LEFT], dtype=np.int64)
+# Позиция направления в one-hot части состояния (порядок UP, DOWN, LEFT, RIGHT)
+ONE_HOT_POSITION = np.array([0, 3, 1, 2])
+
+
+class VectorizedSnakeGame:
+    """
+    N независимых игр «Змейка», выполняемых синхронно.
+
+    Правила и награды совпадают с SnakeGame.step. Состояние всех игр хранится
+    в массивах NumPy: тело каждой змейки — кольцевой буфер координат,
+    занятость клеток — булева сетка, поэтому шаг выполняется векторно
+    для всех игр сразу. Завершившиеся игры автоматически сбрасываются.
+    """
+
+    def __init__(self, num_envs, width=GRID_WIDTH, height=GRID_HEIGHT, seed=None):
+        """
+        :param num_envs: число игр
+        :param width: ширина поля в клетках
+        :param height: высота поля в клетках
+        :param seed: зерно генератора случайных чисел (размещение еды)
+        """
+        self.num_envs = num_envs
+        self.width = width
+        self.height = height
+        self.capacity = width * height
+        self.rng = np.random.default_rng(seed)
+
+        self.body = np.zeros((num_envs, self.capacity, 2), dtype=np.int64)
+        self.head_index = np.zeros(num_envs, dtype=np.int64)  # позиция головы в буфере
+        self.length = np.zeros(num_envs, dtype=np.int64)
+        self.occupied = np.zeros((num_envs, height, width), dtype=bool)
+        # Свободные клетки (номер y * width + x) каждой игры: первые free_count[i]
+        # элементов строки free_cells[i]; free_position — место клетки в строке
+        self.free_cells = np.zeros((num_envs, self.capacity), dtype=np.int64)
+        self.free_position = np.zeros((num_envs, self.capacity), dtype=np.int64)
+        self.free_count = np.zeros(num_envs, dtype=np.int64)
+        self.direction = np.zeros(num_envs, dtype=np.int64)  # индекс в CLOCKWISE
+        self.food = np.zeros((num_envs, 2), dtype=np.int64)
+        self.score = np.zeros(num_envs, dtype=np.int64)
+        self.steps_without_food = np.zeros(num_envs, dtype=np.int64)
+        self._all = np.arange(num_envs)
+
+        self.reset()
+
+    @property
+    def head(self):
+        """Координаты голов всех змеек, форма (N, 2)"""
+        return self.body[self._all, self.head_index]
+
+    def reset(self):
+        """Сбрасывает все игры и возвращает состояния"""
+        self._reset_games(self._all)
+        return self.get_state()
+
+    def _reset_games(self, indices):
+        """Возвращает игры с номерами indices в начальное состояние"""
+        self.occupied[indices] = False
+        self.head_index[indices] = 0
+        self.length[indices] = 1
+        self.body[indices, 0] = (self.width // 2, self.height // 2)
+        self.occupied[indices, self.height // 2, self.width // 2] = True
+        self.free_cells[indices] = np.arange(self.capacity)
+        self.free_position[indices] = np.arange(self.capacity)
+        self.free_count[indices] = self.capacity
+        center = (self.height // 2) * self.width + self.width // 2
+        self._take_cells(indices, np.full(len(indices), center))
+        self.direction[indices] = 1  # RIGHT
+        self.score[indices] = 0
+        self.steps_without_food[indices] = 0
+        self._generate_food(indices)
+
+    def _take_cells(self, games, cells):
+        """Удаляет клетки cells из свободных (по одной на игру) перестановкой с последней"""
+        position = self.free_position[games, cells]
+        self.free_count[games] -= 1
+        last = self.free_cells[games, self.free_count[games]]
+        self.free_cells[games, position] = last
+        self.free_position[games, last] = position
+
+    def _release_cells(self, games, cells):
+        """Возвращает клетки cells в свободные (по одной на игру)"""
+        self.free_cells[games, self.free_count[games]] = cells
+        self.free_position[games, cells] = self.free_count[games]
+        self.free_count[games] += 1
+
+    def _generate_food(self, games):
+        """
+        Размещает еду игр games в случайных свободных клетках.
+        Возвращает маску игр, у которых свободных клеток не осталось.
+        """
+        count = self.free_count[games]
+        full = count == 0  # Поле заполнено змейкой целиком
+        pick = (self.rng.random(len(games)) * np.maximum(count, 1)).astype(np.int64)
+        y, x = np.divmod(self.free_cells[games, pick], self.width)
+        self.food[games[~full]] = np.stack([x, y], axis=1)[~full]
+        return full
+
+    def _out_of_bounds(self, cells):
+        x, y = cells[:, 0], cells[:, 1]
+        return (x < 0) | (x >= self.width) | (y < 0) | (y >= self.height)
+
+    def _is_occupied(self, cells, outside):
+        """Занятость клеток cells (для клеток вне поля — False)"""
+        x = np.clip(cells[:, 0], 0, self.width - 1)
+        y = np.clip(cells[:, 1], 0, self.height - 1)
+        return self.occupied[self._all, y, x] & ~outside
+
+    def get_state(self):
+        """Формирует матрицу признаков состояний формы (N, 12)"""
+        head = self.head
+        ahead = head + CLOCKWISE[self.direction]
+        outside = self._out_of_bounds(ahead)
+        danger = outside | self._is_occupied(ahead, outside)
+
+        state = np.zeros((self.num_envs, 12), dtype=np.float64)
+        state[:, 0] = head[:, 0] / self.width
+        state[:, 1] = head[:, 1] / self.height
+        state[:, 2] = self.food[:, 0] / self.width
+        state[:, 3] = self.food[:, 1] / self.height
+        state[:, 4] = np.abs(head[:, 0] - self.food[:, 0]) / self.width
+        state[:, 5] = np.abs(head[:, 1] - self.food[:, 1]) / self.height
+        state[self._all, 6 + ONE_HOT_POSITION[self.direction]] = 1
+        state[:, 10] = danger
+        state[:, 11] = self.length / self.capacity
+        return state.astype(np.float32)
+
+    def step(self, actions):
+        """
+        Шаг всех игр.
+
+        :param actions: массив действий формы (N,): 0 — вперед, 1 — направо, 2 — налево
+        :return: состояния (N, 12), награды (N,), флаги завершения (N,), info:
+            "score" — счет каждой игры на момент шага,
+            "final_state" — последнее состояние завершившихся игр
+            (для остальных строк — текущее состояние).
+            Состояния завершившихся игр в первом элементе уже после сброса.
+        """
+        actions = np.asarray(actions)
+        self.steps_without_food += 1
+
+        # Изменение направления
+        turn = np.where(actions == 1, 1, np.where(actions == 2, -1, 0))
+        self.direction = (self.direction + turn) % 4
+
+        # Движение
+        head = self.head
+        new_head = head + CLOCKWISE[self.direction]
+
+        # Проверка столкновений (хвост еще не удален, как и в SnakeGame.step)
+        outside = self._out_of_bounds(new_head)
+        collided = outside | self._is_occupied(new_head, outside)
+        alive = ~collided
+        rewards = np.where(collided, -10.0, -0.01)
+        dones = collided.copy()
+
+        # Добавление новой головы
+        moving = self._all[alive]
+        hx, hy = new_head[moving, 0], new_head[moving, 1]
+        self.head_index[moving] = (self.head_index[moving] - 1) % self.capacity
+        self.body[moving, self.head_index[moving]] = new_head[moving]
+        self.occupied[moving, hy, hx] = True
+        self._take_cells(moving, hy * self.width + hx)
+        self.length[moving] += 1
+
+        # Проверка съедания еды
+        ate = alive & np.all(new_head == self.food, axis=1)
+        eaters = self._all[ate]
+        self.score[eaters] += 1
+        rewards[eaters] = 10.0
+        self.steps_without_food[eaters] = 0
+        dones[eaters[self._generate_food(eaters)]] = True
+
+        # Удаляем хвост только если не съели еду
+        shrinking = self._all[alive & ~ate]
+        tail_index = (
+            self.head_index[shrinking] + self.length[shrinking] - 1
+        ) % self.capacity
+        tail = self.body[shrinking, tail_index]
+        self.occupied[shrinking, tail[:, 1], tail[:, 0]] = False
+        self._release_cells(shrinking, tail[:, 1] * self.width + tail[:, 0])
+        self.length[shrinking] -= 1
+
+        # Штраф за слишком долгое блуждание без еды
+        timeout = alive & (self.steps_without_food > self.capacity * 2)
+        rewards[timeout] = -5.0
+        dones |= timeout
+
+        # Награда за приближение к еде
+        old_dist = np.abs(head - self.food).sum(axis=1)
+        new_dist = np.abs(new_head - self.food).sum(axis=1)
+        rewards[alive & (new_dist < old_dist)] += 0.1
+        rewards[alive & (new_dist > old_dist)] -= 0.1
+
+        states = self.get_state()
+        info = {"score": self.score.copy(), "final_state": states.copy()}
+
+        # Автоматический сброс завершившихся игр
+        finished = self._all[dones]
+        if len(finished):
+            self._reset_games(finished)
+            states[finished] = self.get_state()[finished]
+        return states, rewards, dones, info